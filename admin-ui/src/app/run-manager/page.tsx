@@ -7,8 +7,7 @@ import { useAuth } from "../../contexts/AuthContext";
 import {
   fetchRunsManager,
   deleteRunsBulk,
-  fetchRunManagerUsernames,
-  fetchRunManagerWorkspaces,
+  fetchRunManagerFilters,
   RunListItem,
 } from "../../lib/api";
 
@@ -56,10 +55,7 @@ export default function RunManagerPage() {
   useEffect(() => {
     const loadFilters = async () => {
       try {
-        const [u, w] = await Promise.all([
-          fetchRunManagerUsernames(),
-          fetchRunManagerWorkspaces(),
-        ]);
+        const { usernames: u, workspaces: w } = await fetchRunManagerFilters();
         setUsernames(u);
         setAllWorkspaces(w);
       } catch (err) {
@@ -3,7 +3,7 @@
 import { useEffect, useState } from "react";
 import { useParams, useRouter } from "next/navigation";
 import Link from "next/link";
-import { fetchSkill, fetchSkillById, updateSkill, Skill, fetchLlmModels, LlmModelOption } from "../../../../lib/api";
+import { fetchSkill, fetchSkillById, updateSkill, Skill, SkillUpdate, fetchLlmModels, LlmModelOption } from "../../../../lib/api";
 import DashboardLayout from "../../../../components/DashboardLayout";
 import PythonEditor from "../../../../components/PythonEditor";
 import { useAppSelector } from "@/store/hooks";
@@ -155,7 +155,7 @@ export default function EditSkillPage() {
         .map((s) => s.trim())
         .filter(Boolean);
 
-      const updates: Partial<Skill> = {
+      const updates: SkillUpdate = {
         description: formData.description,
         requires,
         produces,
@@ -235,6 +235,11 @@ export default function EditSkillPage() {
       
       updates.enabled = formData.enabled;
 
+      // Reject the save if someone else changed the skill since it was loaded
+      if (originalSkill?.version != null) {
+        updates.if_match_version = originalSkill.version;
+      }
+
       await updateSkill(skillId, updates);
       
       // Reload the skill to get the latest version from server
@@ -394,8 +394,14 @@ export interface Skill {
   workspace_id?: string;
   owner_id?: string;
   is_public?: boolean;
+  version?: number;
 }
 
+// Update payload: any Skill fields plus the optimistic-concurrency guard
+export type SkillUpdate = Partial<Skill> & {
+  if_match_version?: number; // Rejected with 409 if the stored version differs
+};
+
 export type LlmModelOption = {
   model_name: string;
   provider?: string;
@@ -545,7 +551,7 @@ export async function createSkill(skill: Skill): Promise<any> {
   return await res.json();
 }
 
-export async function updateSkill(skillIdOrName: string, updates: Partial<Skill>): Promise<any> {
+export async function updateSkill(skillIdOrName: string, updates: SkillUpdate): Promise<any> {
   const workspaceId = getActiveWorkspaceId();
   const res = await fetch(withWorkspace(`${API_BASE}/admin/skills/${encodeURIComponent(skillIdOrName)}`, workspaceId), {
     method: "PUT",
@@ -689,3 +695,18 @@ export async function fetchRunManagerWorkspaces(): Promise<Array<{ id: string; n
   return data.workspaces || [];
 }
 
+export async function fetchRunManagerFilters(): Promise<{
+  usernames: string[];
+  workspaces: Array<{ id: string; name: string; username?: string }>;
+}> {
+  const res = await fetch(`${API_BASE}/admin/run-manager/filters`, {
+    cache: "no-store",
+    headers: getAuthHeaders(),
+  });
+  if (!res.ok) {
+    throw new Error(`Failed to load filters: ${res.status}`);
+  }
+  const data = await res.json();
+  return { usernames: data.usernames || [], workspaces: data.workspaces || [] };
+}
+
@@ -1297,8 +1297,9 @@ async def list_runs(current_user: AuthenticatedUser, limit: int = 50, workspace_
             async for tup in cp.alist(None, limit=limit):
                 runs.append(_serialize_checkpoint_tuple(tup))
         else:
-            for tup in cp.list(None, limit=limit):  # type: ignore[attr-defined]
-                runs.append(_serialize_checkpoint_tuple(tup))
+            # Sync checkpointers hit the database; keep that off the event loop
+            tuples = await asyncio.to_thread(lambda: list(cp.list(None, limit=limit)))  # type: ignore[attr-defined]
+            runs.extend(_serialize_checkpoint_tuple(tup) for tup in tuples)
     except NotImplementedError:
         pass
     return {"runs": runs}
@@ -1321,7 +1322,8 @@ async def run_detail(thread_id: str, current_user: AuthenticatedUser, workspace_
     except NotImplementedError:
         cp_tuple = None
     if cp_tuple is None and hasattr(cp, "get_tuple"):
-        cp_tuple = cp.get_tuple(config)  # type: ignore[attr-defined]
+        # Sync checkpointers hit the database; keep that off the event loop
+        cp_tuple = await asyncio.to_thread(cp.get_tuple, config)  # type: ignore[attr-defined]
     if cp_tuple is None:
         raise HTTPException(status_code=404, detail="Run not found")
     return _serialize_checkpoint_tuple(cp_tuple)
@@ -1945,5 +1947,17 @@ from api.skills_api import *
 from api.llm_models_api import *
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
-    uvicorn.run(api, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # uvloop is not available on Windows; fall back to the default asyncio loop there.
+    # Multiple workers require the app as an import string rather than the object.
+    uvicorn.run(
+        "api.main:api",
+        host=os.getenv("REST_API_HOST", "0.0.0.0"),
+        port=int(os.getenv("REST_API_PORT", "8000")),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=int(os.getenv("REST_API_WORKERS", os.cpu_count() or 1)),
+        access_log=os.getenv("REST_API_ACCESS_LOG", "false").lower() == "true",
+        log_level=os.getenv("REST_API_LOG_LEVEL", "warning"),
+    )
\ No newline at end of file
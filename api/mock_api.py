@@ -1,9 +1,14 @@
-from typing import Any, Dict, List
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
+import orjson
 from fastapi import APIRouter, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
-from data.mongo import get_collection
+from data.mongo import get_async_collection
 
 
 def json_response(payload: Any, status: int = 200) -> JSONResponse:
@@ -11,18 +16,111 @@ def json_response(payload: Any, status: int = 200) -> JSONResponse:
 
     return JSONResponse(content=payload, status_code=status)
 
+
+# Short-lived in-process cache of successful response bodies for Mongo lookups that
+# are effectively static per key (orders by number, WNFE by limit). Bounded LRU.
+_RESPONSE_CACHE_TTL_SECONDS = 60
+_RESPONSE_CACHE_MAX_ENTRIES = 1024
+_response_cache: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+
+def _cache_get(key: str) -> Optional[bytes]:
+    """Return a cached response body, or None when missing or expired."""
+
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+    if (time.time() - entry[0]) >= _RESPONSE_CACHE_TTL_SECONDS:
+        _response_cache.pop(key, None)
+        return None
+    _response_cache.move_to_end(key)
+    return entry[1]
+
+
+def _cache_set(key: str, body: bytes) -> None:
+    """Store a response body, evicting the least recently used entries past the cap."""
+
+    _response_cache[key] = (time.time(), body)
+    _response_cache.move_to_end(key)
+    while len(_response_cache) > _RESPONSE_CACHE_MAX_ENTRIES:
+        _response_cache.popitem(last=False)
+
+
+def cached_json_response(body: bytes, hit: bool) -> Response:
+    """Return pre-serialized JSON, flagging whether it came from the response cache."""
+
+    return Response(content=body, media_type="application/json", headers={"X-Cache": "HIT" if hit else "MISS"})
+
+
+async def _json_array_chunks(first: Optional[Dict[str, Any]], cursor: Any) -> AsyncIterator[bytes]:
+    """Emit `first` followed by the remaining cursor documents as one JSON array, row by row."""
+
+    yield b"["
+    if first is not None:
+        yield orjson.dumps(first, default=str)
+        async for doc in cursor:
+            yield b"," + orjson.dumps(doc, default=str)
+    yield b"]"
+
+
+async def _stream_json_array(
+    first: Optional[Dict[str, Any]],
+    cursor: Any,
+    cache_key: Optional[str] = None,
+) -> AsyncIterator[bytes]:
+    """Stream the JSON array; with `cache_key`, cache the full body once the cursor is drained."""
+
+    body = bytearray() if cache_key else None
+    async for chunk in _json_array_chunks(first, cursor):
+        if body is not None:
+            body += chunk
+        yield chunk
+    if cache_key:
+        _cache_set(cache_key, bytes(body))
+
+
+def stream_json_array(first: Optional[Dict[str, Any]], cursor: Any, cache_key: Optional[str] = None) -> StreamingResponse:
+    """Stream a Mongo cursor as a JSON array without materializing it in memory."""
+
+    return StreamingResponse(
+        _stream_json_array(first, cursor, cache_key),
+        media_type="application/json",
+        headers={"X-Cache": "MISS"} if cache_key else None,
+    )
+
+
 router = APIRouter(prefix="/mock", tags=["mock"])
 
+# Mock order numbers are exactly 8 ASCII digits.
+_ORDER_RE = re.compile(r"\d{8}", re.ASCII)
+
+# Static mock payloads are serialized once at import; handlers return the bytes directly.
+_PROFILE_BYTES = orjson.dumps({
+    "full_name": "Jordan Example",
+    "dob": "1990-05-14",
+    "ssn": "123-45-6789",
+    "address": "123 Main St, Springfield, USA",
+})
+_PROFILE_HEADERS = {
+    "Cache-Control": "public, max-age=3600",
+    "ETag": f'"{hashlib.sha1(_PROFILE_BYTES).hexdigest()}"',
+}
+_CRIMINAL_CHECK_RESULT = {
+    "criminal_status": "clear",
+    "risk_score": 12,
+    "scoresheet": {"risk": {"final_score": 12}},
+}
+_EDUCATION_RESULT = {
+    "degree": "B.Sc. Computer Science",
+    "grad_year": "2012",
+    "is_qualified": True,
+}
+
 
 @router.get("/profile")
 async def mock_profile():
     """Return a hardcoded candidate profile."""
-    return {
-        "full_name": "Jordan Example",
-        "dob": "1990-05-14",
-        "ssn": "123-45-6789",
-        "address": "123 Main St, Springfield, USA",
-    }
+    return Response(content=_PROFILE_BYTES, media_type="application/json", headers=_PROFILE_HEADERS)
 
 
 @router.post("/criminal-check")
@@ -31,37 +129,40 @@ async def mock_criminal_check(payload: dict):
     Return a deterministic mock criminal check response.
     Echoes input and supplies fixed outputs.
     """
-    return {
-        "input_received": payload,
-        "criminal_status": "clear",
-        "risk_score": 12,
-        "scoresheet": {"risk": {"final_score": 12}},
-    }
+    return Response(
+        content=orjson.dumps({"input_received": payload, **_CRIMINAL_CHECK_RESULT}),
+        media_type="application/json",
+    )
 
 
 @router.post("/education-verify")
 async def mock_education(payload: dict):
     """Return a canned education verification result."""
-    return {
-        "input_received": payload,
-        "degree": "B.Sc. Computer Science",
-        "grad_year": "2012",
-        "is_qualified": True,
-    }
+    return Response(
+        content=orjson.dumps({"input_received": payload, **_EDUCATION_RESULT}),
+        media_type="application/json",
+    )
 
 
 @router.get("/wnfe")
-async def get_wnfe_list(limit: int = 9):
+async def get_wnfe_list(limit: int = Query(9, ge=1, le=1000, description="Maximum number of WNFE records to return")):
     """Fetch WNFE records from MongoDB collection `wnfe`.
 
     Previous mock generation logic has been commented out for reference.
     """
 
+    cache_key = f"wnfe:{limit}"
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached_json_response(cached, hit=True)
+
     try:
-        collection = get_collection("wnfe")
+        collection = get_async_collection("wnfe")
         # Exclude MongoDB's internal _id field by default
-        cursor = collection.find({}, {"_id": 0}).limit(limit)
-        result: List[Dict[str, Any]] = list(cursor)
+        # batch_size(limit) returns the whole page in the first batch (no getMore round-trips)
+        cursor = collection.find({}, {"_id": 0}).limit(limit).batch_size(limit)
+        # Fetch the first document up front so connection errors still map to a 500
+        first = await anext(cursor, None)
     except Exception as exc:  # pragma: no cover - safety net around DB access
         return json_response(
             {
@@ -101,23 +202,28 @@ async def get_wnfe_list(limit: int = 9):
     #         "source": source
     #     })
 
-    return json_response(result)
+    return stream_json_array(first, cursor, cache_key=cache_key)
 
 
 @router.get("/orders/{order_number}")
-def get_order_details(order_number: str):
+async def get_order_details(order_number: str):
 
     # Accept any given 8 digit number for mock; lightly validate format.
-    if not (order_number.isdigit() and len(order_number) == 8):
+    if not _ORDER_RE.fullmatch(order_number):
         return json_response(
             {"error": "Invalid order number, expected 8 digit numeric string", "order_number": order_number},
             status=400,
         )
 
+    cache_key = f"order:{order_number}"
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached_json_response(cached, hit=True)
+
     try:
-        collection = get_collection("orders")
+        collection = get_async_collection("orders")
         # Look up by order_number field; exclude internal _id by default
-        doc = collection.find_one({"order_number": order_number}, {"_id": 0})
+        doc = await collection.find_one({"order_number": order_number}, {"_id": 0})
     except Exception as exc:  # pragma: no cover - safety net around DB access
         return json_response(
             {
@@ -182,38 +288,44 @@ def get_order_details(order_number: str):
     if "order_number" not in doc:
         doc["order_number"] = order_number
 
-    return json_response(doc)
+    # Only successful lookups are cached; 4xx/5xx above return before this point.
+    body = orjson.dumps(doc, default=str)
+    _cache_set(cache_key, body)
+    return cached_json_response(body, hit=False)
 
 
 @router.get("/queues")
-def list_queue_orders(queue_name: str = Query(..., description="Queue name to list orders for")):
+async def list_queue_orders(
+    queue_name: str = Query(..., description="Queue name to list orders for"),
+    limit: int = Query(200, ge=1, le=1000, description="Maximum number of orders to return"),
+):
     
     # load from mongodb / orders collection
-    collection = get_collection("orders")
-    # cursor = collection.find({"queue_name": queue_name}, {"_id": 0})
-    # result: List[Dict[str, Any]] = list(cursor)
-    # Query orders for the given queue_name
-    orders = collection.find({}, {"_id": 0, "order_number": 1})
+    collection = get_async_collection("orders")
+    # Query orders for the given queue_name; project and cap server-side
+    orders = collection.find(
+        {"queue_name": queue_name}, {"_id": 0, "order_number": 1}
+    ).limit(limit)
     result = [
         {
             "order_id": order.get("order_number"),
             "service_name": queue_name,
         }
-        for order in orders
+        async for order in orders
     ]
     return json_response(result)
 
 
 @router.get("/logbook")
-def get_logbook():
+async def get_logbook(
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (default: all)"),
+):
     # employer_name = params["employer_name"]
-    collection = get_collection("logbook")
+    collection = get_async_collection("logbook")
     # doc = collection.find_one({"employer_name": employer_name}, {"_id": 0})
-    cursor = collection.find({}, {"_id": 0})
-    result: List[Dict[str, Any]] = list(cursor)
-    return json_response(result)
-
-# router.add_route("GET", "/api/clearstar/orders/{order_number}", get_order_details)
-# router.add_route("GET", "/api/clearstar/wnfe", get_wnfe_list)
-# router.add_route("GET", "/api/clearstar/queues/{queue_name}", list_queue_orders)
-# router.add_route("GET", "/api/clearstar/logbook", get_logbook)
\ No newline at end of file
+    projection: Dict[str, int] = {"_id": 0}
+    if fields:
+        projection.update({f: 1 for f in (name.strip() for name in fields.split(",")) if f and f != "_id"})
+    cursor = collection.find({}, projection)
+    first = await anext(cursor, None)
+    return stream_json_array(first, cursor)
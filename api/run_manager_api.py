@@ -2,8 +2,15 @@
 Run Manager API - Simplified endpoints for run management with bulk operations
 """
 import asyncio
-from typing import Optional, List
-from fastapi import APIRouter, HTTPException, Query
+import base64
+import functools
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Optional, List, Tuple
+from fastapi import APIRouter, HTTPException, Query, Response
+from psycopg.rows import dict_row
 from pydantic import BaseModel
 from services.auth_middleware import AdminUser
 from services.connection_pool import get_postgres_pool
@@ -11,6 +18,65 @@ from log_stream import emit_log
 
 router = APIRouter(prefix="/admin/run-manager", tags=["run-manager"])
 
+# Totals for keyset (cursor) pages, keyed by filter values. Counting is a full scan,
+# so cursor pages reuse a recent total instead of recounting on every scroll.
+# The key includes free-text search, so the cache is a bounded LRU.
+_COUNT_CACHE_TTL_SECONDS = 30
+_COUNT_CACHE_MAX_ENTRIES = 256
+_run_count_cache: "OrderedDict[Tuple[Optional[str], Optional[str], Optional[str]], Tuple[float, int]]" = OrderedDict()
+# Accessed from to_thread workers and the event loop, so every access holds this lock
+_run_count_lock = threading.Lock()
+
+# Filter dropdown values (usernames, workspaces) change on the order of minutes,
+# so they are served from memory for a short TTL instead of a DISTINCT scan per open.
+_FILTER_CACHE_TTL_SECONDS = 60
+_filter_cache: dict = {}
+_filter_cache_lock = asyncio.Lock()
+
+
+async def _get_cached_filter(key: str, fetch: Callable[[], Any]) -> Any:
+    """Return a cached filter value, running `fetch` in a thread on miss (one fetch at a time)."""
+    cached = _filter_cache.get(key)
+    if cached and (time.time() - cached[0]) < _FILTER_CACHE_TTL_SECONDS:
+        return cached[1]
+    async with _filter_cache_lock:
+        # Another request may have refreshed the entry while we waited on the lock
+        cached = _filter_cache.get(key)
+        if cached and (time.time() - cached[0]) < _FILTER_CACHE_TTL_SECONDS:
+            return cached[1]
+        value = await asyncio.to_thread(fetch)
+        _filter_cache[key] = (time.time(), value)
+        return value
+
+
+def _get_cached_run_count(key: Tuple[Optional[str], Optional[str], Optional[str]]) -> Optional[int]:
+    """Return a cached total, or None when missing or expired."""
+    with _run_count_lock:
+        entry = _run_count_cache.get(key)
+        if entry is None:
+            return None
+        if (time.time() - entry[0]) >= _COUNT_CACHE_TTL_SECONDS:
+            _run_count_cache.pop(key, None)
+            return None
+        _run_count_cache.move_to_end(key)
+        return entry[1]
+
+
+def _set_cached_run_count(key: Tuple[Optional[str], Optional[str], Optional[str]], total: int) -> None:
+    """Store a freshly computed total, evicting the least recently used entries past the cap."""
+    with _run_count_lock:
+        _run_count_cache[key] = (time.time(), total)
+        _run_count_cache.move_to_end(key)
+        while len(_run_count_cache) > _COUNT_CACHE_MAX_ENTRIES:
+            _run_count_cache.popitem(last=False)
+
+
+def _invalidate_run_caches() -> None:
+    """Drop cached totals and filter values after runs are removed."""
+    with _run_count_lock:
+        _run_count_cache.clear()
+    _filter_cache.clear()
+
 
 class RunListItem(BaseModel):
     """Simplified run list item for data-dense tabular display"""
@@ -29,6 +95,104 @@ class RunListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the following page
+
+
+def _encode_cursor(created_at: Optional[datetime], thread_id: str) -> str:
+    """
+    Encode the (created_at, thread_id) keyset position of a row as an opaque cursor.
+    
+    Rows with NULL created_at sort last; their cursor has an empty timestamp and
+    pages through the NULL rows by thread_id alone.
+    """
+    raw = f"{created_at.isoformat() if created_at is not None else ''}|{thread_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[Optional[datetime], str]:
+    """Decode a cursor produced by _encode_cursor. Raises ValueError if malformed."""
+    raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+    created_at, thread_id = raw.split("|", 1)
+    return (datetime.fromisoformat(created_at) if created_at else None), thread_id
+
+
+@functools.lru_cache(maxsize=16)
+def _build_run_list_sql(has_user: bool, has_workspace: bool, has_search: bool) -> Tuple[str, str, str, str]:
+    """
+    Build (count_sql, page_sql, keyset_sql, keyset_null_sql) for a filter shape.
+    
+    Only 8 shapes exist, so the SQL text is built once per shape and reused; the
+    stable text also keeps prepared statements hitting the same server-side plan.
+    Parameter order: username, workspace, search x2, then the paging values.
+    """
+    where_clauses = []
+    if has_user:
+        where_clauses.append("u.username = %s")
+    if has_workspace:
+        where_clauses.append("rm.workspace_id = %s")
+    if has_search:
+        where_clauses.append("(rm.thread_id ILIKE %s OR rm.run_name ILIKE %s)")
+    where_sql = " AND ".join(where_clauses) if where_clauses else "TRUE"
+    
+    count_sql = f"""
+        SELECT COUNT(*)
+        FROM run_metadata rm
+        LEFT JOIN users u ON rm.user_id = u.id
+        WHERE {where_sql}
+    """
+    
+    # The window COUNT reuses the same join/filter pass to report the total,
+    # so offset pages need no separate COUNT(*) query
+    page_sql = f"""
+        SELECT
+            rm.thread_id,
+            rm.run_name,
+            rm.status,
+            rm.created_at,
+            u.username,
+            rm.workspace_id,
+            w.name as workspace_name,
+            COUNT(*) OVER () AS total
+        FROM run_metadata rm
+        LEFT JOIN users u ON rm.user_id = u.id
+        LEFT JOIN workspaces w ON rm.workspace_id = w.id
+        WHERE {where_sql}
+        ORDER BY rm.created_at DESC NULLS LAST, rm.thread_id DESC
+        LIMIT %s OFFSET %s
+    """
+    
+    # Keyset page: seek past the cursor row instead of scanning OFFSET rows. The row
+    # comparison is NULL for NULL created_at, so those rows (sorted last) are added
+    # explicitly; once the cursor is inside them, keyset_null_sql pages by thread_id.
+    keyset_select = """
+        SELECT
+            rm.thread_id,
+            rm.run_name,
+            rm.status,
+            rm.created_at,
+            u.username,
+            rm.workspace_id,
+            w.name as workspace_name
+        FROM run_metadata rm
+        LEFT JOIN users u ON rm.user_id = u.id
+        LEFT JOIN workspaces w ON rm.workspace_id = w.id
+    """
+    keyset_sql = f"""
+        {keyset_select}
+        WHERE {where_sql}
+          AND ((rm.created_at, rm.thread_id) < (%s, %s) OR rm.created_at IS NULL)
+        ORDER BY rm.created_at DESC NULLS LAST, rm.thread_id DESC
+        LIMIT %s
+    """
+    keyset_null_sql = f"""
+        {keyset_select}
+        WHERE {where_sql}
+          AND rm.created_at IS NULL AND rm.thread_id < %s
+        ORDER BY rm.thread_id DESC
+        LIMIT %s
+    """
+    
+    return count_sql, page_sql, keyset_sql, keyset_null_sql
 
 
 class BulkDeleteRequest(BaseModel):
@@ -50,92 +214,111 @@ async def list_runs_simplified(
     username: Optional[str] = Query(None, description="Filter by username"),
     workspace: Optional[str] = Query(None, description="Filter by workspace ID"),
     search: Optional[str] = Query(None, description="Search in thread_id, run_name"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor from a previous page); overrides page"),
 ):
     """
     List all runs with simplified data for tabular display.
     Admin-only endpoint with pagination, filtering, and search.
+    
+    Supports two pagination modes:
+    - page/page_size: OFFSET pagination (cost grows with page depth)
+    - cursor: keyset pagination on (created_at, thread_id), constant cost at any depth;
+      returns the same rows as offset paging, including runs with no created_at
     """
+    after = None
+    if cursor:
+        try:
+            after = _decode_cursor(cursor)
+        except (ValueError, UnicodeDecodeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
     pool = get_postgres_pool()
     
     def _fetch_runs():
         conn = pool.getconn()
         try:
-            with conn.cursor() as cur:
-                # Build WHERE clause dynamically
-                where_clauses = []
+            with conn.cursor(row_factory=dict_row) as cur:
                 params = []
-                
                 if username:
-                    where_clauses.append("u.username = %s")
                     params.append(username)
-                
                 if workspace:
-                    where_clauses.append("rm.workspace_id = %s")
                     params.append(workspace)
-                
                 if search:
-                    where_clauses.append("(rm.thread_id ILIKE %s OR rm.run_name ILIKE %s)")
                     search_param = f"%{search}%"
                     params.extend([search_param, search_param])
                 
-                where_sql = " AND ".join(where_clauses) if where_clauses else "TRUE"
+                count_sql, page_sql, keyset_sql, keyset_null_sql = _build_run_list_sql(
+                    bool(username), bool(workspace), bool(search)
+                )
+                count_key = (username, workspace, search)
                 
-                # Get total count
-                count_sql = f"""
-                    SELECT COUNT(*)
-                    FROM run_metadata rm
-                    LEFT JOIN users u ON rm.user_id = u.id
-                    WHERE {where_sql}
-                """
-                cur.execute(count_sql, params)
-                total = cur.fetchone()[0]
+                # Each filter shape has a stable SQL text, so prepare=True lets the
+                # pooled connection keep one server-side plan per shape across admin polls
+                if after and after[0] is None:
+                    cur.execute(keyset_null_sql, params + [after[1], page_size], prepare=True)
+                elif after:
+                    cur.execute(keyset_sql, params + [after[0], after[1], page_size], prepare=True)
+                else:
+                    offset = (page - 1) * page_size
+                    cur.execute(page_sql, params + [page_size, offset], prepare=True)
                 
-                # Get paginated results
-                offset = (page - 1) * page_size
-                list_sql = f"""
-                    SELECT
-                        rm.thread_id,
-                        rm.run_name,
-                        rm.status,
-                        rm.created_at,
-                        u.username,
-                        rm.workspace_id,
-                        w.name as workspace_name
-                    FROM run_metadata rm
-                    LEFT JOIN users u ON rm.user_id = u.id
-                    LEFT JOIN workspaces w ON rm.workspace_id = w.id
-                    WHERE {where_sql}
-                    ORDER BY rm.created_at DESC NULLS LAST
-                    LIMIT %s OFFSET %s
-                """
-                cur.execute(list_sql, params + [page_size, offset])
-                rows = cur.fetchall()
+                # Build items straight from the cursor; no intermediate fetchall() list
+                runs = []
+                total = None
+                last_row = None
+                for row in cur:
+                    if total is None:
+                        total = row.get("total")
+                    # Trusted DB rows: skip per-row validation
+                    runs.append(RunListItem.model_construct(
+                        id=row["thread_id"],
+                        name=row["run_name"] or row["thread_id"],  # Fallback to thread_id if no run_name
+                        result=row["status"],
+                        time=row["created_at"].isoformat() if row["created_at"] else None,
+                        username=row["username"],
+                        workspace=str(row["workspace_id"]) if row["workspace_id"] else None,  # Convert UUID to string
+                        workspace_name=row["workspace_name"],
+                    ))
+                    last_row = row
                 
-                runs = [
-                    RunListItem(
-                        id=row[0],
-                        name=row[1] or row[0],  # Fallback to thread_id if no run_name
-                        result=row[2],
-                        time=row[3].isoformat() if row[3] else None,
-                        username=row[4],
-                        workspace=str(row[5]) if row[5] else None,  # Convert UUID to string
-                        workspace_name=row[6],
-                    )
-                    for row in rows
-                ]
+                if after:
+                    # A hit does not touch the timestamp, so the TTL still expires
+                    total = _get_cached_run_count(count_key)
+                    if total is None:
+                        cur.execute(count_sql, params, prepare=True)
+                        total = cur.fetchone()["count"]
+                        _set_cached_run_count(count_key, total)
+                else:
+                    if total is None:
+                        if offset:
+                            # Page is past the end, so the window produced no rows to read the total from
+                            cur.execute(count_sql, params, prepare=True)
+                            total = cur.fetchone()["count"]
+                        else:
+                            total = 0
+                    # Offset pages always compute a fresh total
+                    _set_cached_run_count(count_key, total)
                 
-                return runs, total
+                next_cursor = None
+                if len(runs) == page_size:
+                    next_cursor = _encode_cursor(last_row["created_at"], last_row["thread_id"])
+                
+                return runs, total, next_cursor
         finally:
             pool.putconn(conn)
     
     try:
-        runs, total = await asyncio.to_thread(_fetch_runs)
-        return RunListResponse(
+        runs, total, next_cursor = await asyncio.to_thread(_fetch_runs)
+        payload = RunListResponse.model_construct(
             runs=runs,
             total=total,
             page=page,
             page_size=page_size,
+            next_cursor=next_cursor,
         )
+        # Returning a Response skips FastAPI's response_model re-validation;
+        # response_model stays on the route for the OpenAPI schema.
+        return Response(content=payload.model_dump_json(), media_type="application/json")
     except Exception as e:
         emit_log(f"[RUN_MANAGER] Failed to fetch runs: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch runs: {str(e)}")
@@ -160,62 +343,77 @@ async def delete_runs_bulk(
         raise HTTPException(status_code=400, detail="No thread_ids provided")
     
     pool = get_postgres_pool()
-    deleted_count = 0
-    failed = []
+    thread_ids = list(dict.fromkeys(request.thread_ids))  # De-duplicate, keep order
     
-    def _delete_run(thread_id: str):
-        """Delete all traces of a single run"""
+    def _delete_runs(ids: List[str]) -> List[str]:
+        """
+        Delete all traces of the given runs in a single transaction.
+        
+        Returns every id that had rows in any table, so a run whose metadata row
+        is already gone but still has checkpoints or logs counts as deleted.
+        """
         conn = pool.getconn()
         try:
-            with conn.cursor() as cur:
-                # Delete in order to respect foreign key constraints
-                # Note: No foreign keys exist, but we delete children before parents for safety
-                
-                # 1. checkpoint_writes (child of checkpoints)
-                cur.execute("""
-                    DELETE FROM checkpoint_writes
-                    WHERE thread_id = %s
-                """, (thread_id,))
-                
-                # 2. checkpoint_blobs (child of checkpoints)
-                cur.execute("""
-                    DELETE FROM checkpoint_blobs
-                    WHERE thread_id = %s
-                """, (thread_id,))
-                
-                # 3. checkpoints
-                cur.execute("""
-                    DELETE FROM checkpoints
-                    WHERE thread_id = %s
-                """, (thread_id,))
-                
-                # 4. thread_logs (not logs!)
-                cur.execute("""
-                    DELETE FROM thread_logs
-                    WHERE thread_id = %s
-                """, (thread_id,))
-                
-                # 5. run_metadata
-                cur.execute("""
-                    DELETE FROM run_metadata
-                    WHERE thread_id = %s
-                """, (thread_id,))
-                
-                conn.commit()
-                return True
-        except Exception as e:
-            conn.rollback()
-            raise e
+            with conn.transaction():
+                with conn.cursor() as cur:
+                    # Delete in order to respect foreign key constraints
+                    # Note: No foreign keys exist, but we delete children before parents for safety
+                    # 1. checkpoint_writes (child of checkpoints)
+                    # 2. checkpoint_blobs (child of checkpoints)
+                    # 3. checkpoints
+                    # 4. thread_logs (not logs!)
+                    # 5. run_metadata
+                    deleted = set()
+                    for table in ("checkpoint_writes", "checkpoint_blobs", "checkpoints", "thread_logs", "run_metadata"):
+                        # Checkpoint tables hold many rows per run; return each id once
+                        cur.execute(f"""
+                            WITH removed AS (
+                                DELETE FROM {table}
+                                WHERE thread_id = ANY(%s)
+                                RETURNING thread_id
+                            )
+                            SELECT DISTINCT thread_id FROM removed
+                        """, (ids,))
+                        deleted.update(row[0] for row in cur.fetchall())
+                    return list(deleted)
         finally:
             pool.putconn(conn)
     
-    for thread_id in request.thread_ids:
-        try:
-            await asyncio.to_thread(_delete_run, thread_id)
+    deleted_ids = set()
+    errors = {}
+    try:
+        deleted_ids.update(await asyncio.to_thread(_delete_runs, thread_ids))
+    except Exception as e:
+        # A single bad run aborts the whole batch; retry per run so the rest still go through.
+        # Use at most half the pool so other requests still get connections meanwhile.
+        emit_log(f"[RUN_MANAGER] Batch delete failed, retrying per run: {e}")
+        semaphore = asyncio.Semaphore(max(1, pool.max_size // 2))
+        
+        async def _delete_one(thread_id: str) -> List[str]:
+            async with semaphore:
+                return await asyncio.to_thread(_delete_runs, [thread_id])
+        
+        results = await asyncio.gather(
+            *(_delete_one(thread_id) for thread_id in thread_ids),
+            return_exceptions=True,
+        )
+        for thread_id, result in zip(thread_ids, results):
+            if isinstance(result, BaseException):
+                errors[thread_id] = str(result)
+            else:
+                deleted_ids.update(result)
+    
+    if deleted_ids:
+        _invalidate_run_caches()
+    
+    deleted_count = 0
+    failed = []
+    for thread_id in thread_ids:
+        if thread_id in deleted_ids:
             deleted_count += 1
             emit_log(f"[RUN_MANAGER] Deleted run: {thread_id}")
-        except Exception as e:
-            error_msg = str(e)
+        else:
+            error_msg = errors.get(thread_id, "Run not found")
             emit_log(f"[RUN_MANAGER] Failed to delete run {thread_id}: {error_msg}")
             failed.append({"thread_id": thread_id, "error": error_msg})
     
@@ -226,7 +424,7 @@ async def delete_runs_bulk(
 
 
 @router.get("/usernames")
-async def list_usernames(current_user: AdminUser):
+async def list_usernames(current_user: AdminUser, response: Response):
     """
     Get list of all unique usernames that have runs.
     Used for filter dropdown.
@@ -236,7 +434,7 @@ async def list_usernames(current_user: AdminUser):
     def _fetch_usernames():
         conn = pool.getconn()
         try:
-            with conn.cursor() as cur:
+            with conn.cursor(row_factory=dict_row) as cur:
                 cur.execute("""
                     SELECT DISTINCT u.username
                     FROM run_metadata rm
@@ -244,12 +442,13 @@ async def list_usernames(current_user: AdminUser):
                     WHERE u.username IS NOT NULL
                     ORDER BY u.username
                 """)
-                return [row[0] for row in cur.fetchall()]
+                return [row["username"] for row in cur]
         finally:
             pool.putconn(conn)
     
     try:
-        usernames = await asyncio.to_thread(_fetch_usernames)
+        usernames = await _get_cached_filter("usernames", _fetch_usernames)
+        response.headers["Cache-Control"] = f"private, max-age={_FILTER_CACHE_TTL_SECONDS // 2}"
         return {"usernames": usernames}
     except Exception as e:
         emit_log(f"[RUN_MANAGER] Failed to fetch usernames: {e}")
@@ -257,7 +456,7 @@ async def list_usernames(current_user: AdminUser):
 
 
 @router.get("/workspaces")
-async def list_workspaces(current_user: AdminUser):
+async def list_workspaces(current_user: AdminUser, response: Response):
     """
     Get list of all unique workspaces that have runs, including user info.
     Used for filter dropdown with client-side filtering by username.
@@ -267,7 +466,7 @@ async def list_workspaces(current_user: AdminUser):
     def _fetch_workspaces():
         conn = pool.getconn()
         try:
-            with conn.cursor() as cur:
+            with conn.cursor(row_factory=dict_row) as cur:
                 cur.execute("""
                     SELECT DISTINCT 
                         w.id, 
@@ -281,18 +480,70 @@ async def list_workspaces(current_user: AdminUser):
                 """)
                 return [
                     {
-                        "id": str(row[0]), 
-                        "name": row[1] or str(row[0]),
-                        "username": row[2]
+                        "id": str(row["id"]), 
+                        "name": row["name"] or str(row["id"]),
+                        "username": row["username"]
                     } 
-                    for row in cur.fetchall()
+                    for row in cur
                 ]
         finally:
             pool.putconn(conn)
     
     try:
-        workspaces = await asyncio.to_thread(_fetch_workspaces)
+        workspaces = await _get_cached_filter("workspaces", _fetch_workspaces)
+        response.headers["Cache-Control"] = f"private, max-age={_FILTER_CACHE_TTL_SECONDS // 2}"
         return {"workspaces": workspaces}
     except Exception as e:
         emit_log(f"[RUN_MANAGER] Failed to fetch workspaces: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch workspaces: {str(e)}")
+
+
+@router.get("/filters")
+async def list_filters(current_user: AdminUser, response: Response):
+    """
+    Get usernames and workspaces for the filter panel in one round-trip.
+    Same payloads as /usernames and /workspaces, from a single UNION ALL query.
+    """
+    pool = get_postgres_pool()
+    
+    def _fetch_filters():
+        conn = pool.getconn()
+        try:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute("""
+                    SELECT 'username' AS kind, u.username, NULL AS name, NULL AS id
+                    FROM run_metadata rm
+                    JOIN users u ON rm.user_id = u.id
+                    WHERE u.username IS NOT NULL
+                    GROUP BY u.username
+                    UNION ALL
+                    SELECT 'workspace' AS kind, u.username, w.name, w.id::text AS id
+                    FROM run_metadata rm
+                    INNER JOIN workspaces w ON rm.workspace_id = w.id
+                    LEFT JOIN users u ON w.user_id = u.id
+                    WHERE rm.workspace_id IS NOT NULL
+                    GROUP BY u.username, w.name, w.id
+                    ORDER BY kind, name, username
+                """)
+                usernames = []
+                workspaces = []
+                for row in cur:
+                    if row["kind"] == "username":
+                        usernames.append(row["username"])
+                    else:
+                        workspaces.append({
+                            "id": row["id"],
+                            "name": row["name"] or row["id"],
+                            "username": row["username"],
+                        })
+                return {"usernames": usernames, "workspaces": workspaces}
+        finally:
+            pool.putconn(conn)
+    
+    try:
+        filters = await _get_cached_filter("filters", _fetch_filters)
+        response.headers["Cache-Control"] = f"private, max-age={_FILTER_CACHE_TTL_SECONDS // 2}"
+        return filters
+    except Exception as e:
+        emit_log(f"[RUN_MANAGER] Failed to fetch filters: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch filters: {str(e)}")
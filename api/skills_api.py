@@ -4,16 +4,180 @@ Skill Management API Endpoints
 These endpoints allow CRUD operations on skills and hot-reload functionality.
 """
 
-from fastapi import HTTPException
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from fastapi import BackgroundTasks, HTTPException, Query, Response
+from pydantic import BaseModel, ConfigDict
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple, Union
+from pathlib import Path
 import ast
-import json
+import asyncio
+import contextlib
+import hashlib
+import logging
+import re
+import time
+
+import orjson
+import psycopg
+from psycopg.rows import RowFactory, dict_row, tuple_row
 
 # Get the API instance from main
 from api.main import api
+from env_loader import load_env_once
 from services.auth_middleware import AuthenticatedUser
+from services.connection_pool import get_postgres_pool
 from services.workspace_service import get_workspace_service
+from skill_manager import (
+    create_skill_and_load,
+    get_all_skills_metadata_batch,
+    get_registry_skill_count,
+    get_registry_version,
+    get_skills_metadata_batch,
+    reload_single_skill,
+    reload_skill_registry,
+    request_registry_reload,
+    unload_skill,
+    update_skill_fields,
+)
+
+# Module-level logger
+logger = logging.getLogger(__name__)
+
+# Resolved once at import instead of per request
+_PROJECT_ROOT = Path(__file__).resolve().parents[1]
+load_env_once(_PROJECT_ROOT)
+
+# Skill IDs are UUIDs; hyphens optional, as uuid.UUID and Postgres both accept
+_UUID_RE = re.compile(r"[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}")
+
+
+def _json_default(value: Any) -> Any:
+    """orjson fallback: registry skills keep requires/produces as sets (the engine uses set algebra)."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+# Serialized get_skill responses keyed by (identifier, workspace_id). Entries belong to one
+# registry version and are dropped when it changes; the TTL covers edits made by other
+# worker processes, which do not bump this process's version.
+_SKILL_RESPONSE_CACHE_TTL_SECONDS = 30
+_SKILL_RESPONSE_CACHE_MAX_ENTRIES = 1024
+_skill_response_cache: Dict[Tuple[str, str], Tuple[float, bytes]] = {}
+_skill_response_cache_version: Optional[int] = None
+
+
+def _get_cached_skill_response(key: Tuple[str, str], version: int) -> Optional[bytes]:
+    """Return a cached get_skill body for this registry version, if still fresh."""
+    global _skill_response_cache_version
+    if _skill_response_cache_version != version:
+        _skill_response_cache.clear()
+        _skill_response_cache_version = version
+        return None
+    cached = _skill_response_cache.get(key)
+    if cached and (time.time() - cached[0]) < _SKILL_RESPONSE_CACHE_TTL_SECONDS:
+        return cached[1]
+    return None
+
+
+def _skill_response(skill_dict: Dict[str, Any], key: Optional[Tuple[str, str]], version: int) -> Response:
+    """
+    Serialize a get_skill payload with orjson (datetimes natively as ISO 8601),
+    caching the bytes under `key` when given.
+    """
+    body = orjson.dumps(skill_dict, default=_json_default)
+    if key is not None and _skill_response_cache_version == version:
+        if len(_skill_response_cache) >= _SKILL_RESPONSE_CACHE_MAX_ENTRIES:
+            _skill_response_cache.clear()
+        _skill_response_cache[key] = (time.time(), body)
+    return Response(content=body, media_type="application/json")
+
+
+def _check_skill_workspace(workspace_id: Optional[str], workspace_owner_id: Optional[str], user_id: str) -> None:
+    """
+    Same checks as WorkspaceService.resolve_workspace, using the workspace owner
+    joined into the skill query instead of a separate lookup.
+    """
+    if not workspace_id:
+        return
+    if workspace_owner_id is None:
+        raise HTTPException(status_code=404, detail="Workspace not found")
+    if workspace_owner_id != user_id:
+        raise HTTPException(status_code=403, detail="Not your workspace")
+
+
+def _fetch_skill_row(
+    sql: str,
+    params: Union[Tuple[Any, ...], Dict[str, Any]],
+    read_only: bool = False,
+    row_factory: RowFactory[Any] = tuple_row,
+) -> Optional[Any]:
+    """
+    Run a single-row query on a pooled connection (call via asyncio.to_thread).
+    
+    Callers pass fixed SQL strings, so statements are prepared server-side and
+    later calls on the same connection only ship parameters. With `read_only`,
+    the query runs in a READ ONLY transaction (no writes, no xid assigned).
+    Rows are tuples unless another psycopg `row_factory` is given.
+    """
+    pool = get_postgres_pool()
+    with pool.connection() as conn:
+        if not read_only:
+            with conn.cursor(row_factory=row_factory) as cur:
+                cur.execute(sql, params, prepare=True)
+                return cur.fetchone()
+        conn.read_only = True
+        try:
+            with conn.transaction():
+                with conn.cursor(row_factory=row_factory) as cur:
+                    cur.execute(sql, params, prepare=True)
+                    return cur.fetchone()
+        finally:
+            # Pooled connections are shared; restore the default before returning it
+            conn.read_only = None
+
+
+# Parse results keyed by a 128-bit BLAKE2b digest of the source (None = parses). Keyed by
+# digest only, so the cache holds no source text; bounded LRU.
+_CODE_CHECK_CACHE_MAX_ENTRIES = 4096
+_code_check_cache: "OrderedDict[bytes, Optional[Dict[str, Any]]]" = OrderedDict()
+
+
+def _python_code_error(code: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the 400 error detail for `code`, or None if it parses.
+    
+    Results are content-addressed, so repeated saves of unchanged code skip the parse.
+    """
+    key = hashlib.blake2b(code.encode(), digest_size=16).digest()
+    if key in _code_check_cache:
+        _code_check_cache.move_to_end(key)
+        return _code_check_cache[key]
+    
+    error = None
+    try:
+        # Same parse as ast.parse, minus the wrapper; dont_inherit skips the caller's __future__ flags
+        compile(code, "<skill>", "exec", flags=ast.PyCF_ONLY_AST, dont_inherit=True)
+    except SyntaxError as e:
+        error = {
+            "error": "Python syntax error",
+            "message": str(e.msg),
+            "line": e.lineno,
+            "offset": e.offset,
+            "text": e.text.strip() if e.text else None,
+            "hint": "Please fix the syntax error before saving. Common issues: missing colons, incorrect indentation, typos in keywords like 'def'"
+        }
+    except Exception as e:
+        error = {
+            "error": "Code validation failed",
+            "message": str(e),
+            "hint": "Please ensure the code is valid Python"
+        }
+    
+    _code_check_cache[key] = error
+    if len(_code_check_cache) > _CODE_CHECK_CACHE_MAX_ENTRIES:
+        _code_check_cache.popitem(last=False)
+    return error
 
 
 def validate_python_code(code: str, field_name: str = "code") -> None:
@@ -24,35 +188,47 @@ def validate_python_code(code: str, field_name: str = "code") -> None:
     if not code or not code.strip():
         return  # Empty code is allowed
     
-    try:
-        ast.parse(code)
-    except SyntaxError as e:
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "error": "Python syntax error",
-                "field": field_name,
-                "message": str(e.msg),
-                "line": e.lineno,
-                "offset": e.offset,
-                "text": e.text.strip() if e.text else None,
-                "hint": "Please fix the syntax error before saving. Common issues: missing colons, incorrect indentation, typos in keywords like 'def'"
-            }
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "error": "Code validation failed",
-                "field": field_name,
-                "message": str(e),
-                "hint": "Please ensure the code is valid Python"
-            }
-        )
+    error = _python_code_error(code)
+    if error is not None:
+        raise HTTPException(status_code=400, detail={"error": error["error"], "field": field_name, **error})
+
+
+def _code_hash(code: Optional[str]) -> Optional[bytes]:
+    """SHA-256 digest stored next to validated code (dynamic_skills.*_hash), None for empty code."""
+    if not code or not code.strip():
+        return None
+    return hashlib.sha256(code.encode()).digest()
+
+
+# Action types whose action_code is inline Python (data_pipeline YAML etc. is not parsed)
+_PYTHON_ACTION_TYPES = frozenset({"python"})
+
+
+def _maybe_validate_action_code(
+    action_code: Optional[str],
+    executor: Optional[str],
+    action_config: Optional[Dict[str, Any]],
+    validated_hash: Optional[bytes] = None,
+) -> Optional[bytes]:
+    """
+    Validate action_code if it is inline Python for the action executor.
+    
+    Returns the hash to store for the code (None when it is not inline Python).
+    Code whose hash equals `validated_hash` was validated before and is not re-parsed.
+    """
+    if not action_code or executor != "action" or (action_config or {}).get("type") not in _PYTHON_ACTION_TYPES:
+        return None
+    code_hash = _code_hash(action_code)
+    if code_hash is not None and code_hash != validated_hash:
+        validate_python_code(action_code, "action_code")
+    return code_hash
+
 
 # --- SKILL MANAGEMENT ENDPOINTS ---
 
 class SkillCreateRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     name: str
     description: str
     requires: List[str] = []
@@ -74,6 +250,8 @@ class SkillCreateRequest(BaseModel):
 
 class SkillUpdateRequest(BaseModel):
     """Request model for updating a skill. Note: name cannot be changed after creation."""
+    model_config = ConfigDict(frozen=True)
+    
     name: Optional[str] = None  # Will be rejected if provided
     description: Optional[str] = None
     requires: Optional[List[str]] = None
@@ -90,27 +268,117 @@ class SkillUpdateRequest(BaseModel):
     action_code: Optional[str] = None
     action_functions: Optional[str] = None
     is_public: Optional[bool] = None
+    if_match_version: Optional[int] = None  # Version the client read; stale updates get 409
+
+
+# Full dynamic_skills row for get_skill, one fixed statement per lookup column so each
+# is prepared once per pooled connection. Fetched with dict_row, so every column keeps
+# its name (casts are aliased back to the column name).
+_SKILL_FULL_COLUMNS = """
+    id::text AS id, name, module_name, description, requires, produces, optional_produces,
+    executor, hitl_enabled, prompt, system_prompt, llm_model,
+    rest_config, action_config, action_code, action_functions,
+    source, enabled, created_at, updated_at,
+    workspace_id::text AS workspace_id, owner_id::text AS owner_id, is_public, version
+"""
+_SKILL_FULL_SELECT = {
+    column: f"SELECT {_SKILL_FULL_COLUMNS} FROM dynamic_skills WHERE {column} = %s"
+    for column in ("id", "name", "module_name")
+}
+# Names are only unique per workspace: pick the row visible in the workspace, preferring its own
+_SKILL_FULL_SELECT_VISIBLE_BY_NAME = f"""
+    SELECT {_SKILL_FULL_COLUMNS} FROM dynamic_skills
+    WHERE name = %(name)s
+      AND (workspace_id = %(workspace_id)s OR workspace_id IS NULL OR is_public)
+    ORDER BY (workspace_id = %(workspace_id)s) DESC NULLS LAST
+    LIMIT 1
+"""
+
+# update_skill's current row plus the workspace owner (for the workspace check) in one query
+_SKILL_UPDATE_SELECT = """
+    SELECT ds.name, ds.module_name, ds.description, ds.requires, ds.produces, ds.optional_produces,
+           ds.executor, ds.hitl_enabled, ds.prompt, ds.system_prompt, ds.llm_model,
+           ds.rest_config, ds.action_config, ds.action_code, ds.action_functions,
+           ds.workspace_id::text, ds.owner_id::text, ds.is_public, ds.source, ds.version,
+           w.user_id::text, ds.action_code_hash, ds.action_functions_hash, ds.enabled
+    FROM dynamic_skills ds
+    LEFT JOIN workspaces w ON w.id = ds.workspace_id
+    WHERE ds.id = %s
+"""
+
+# Row fields get_skill overlays on a registry skill (same keys as Skill.db_metadata)
+_DB_METADATA_KEYS = (
+    "id", "enabled", "created_at", "updated_at", "action_code", "action_functions",
+    "module_name", "workspace_id", "owner_id", "is_public", "version",
+)
+
+
+def _skill_dict_from_full_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the get_skill payload from a _SKILL_FULL_SELECT row (fetched with dict_row)."""
+    return {
+        **row,
+        "requires": row["requires"] or [],
+        "produces": row["produces"] or [],
+        "optional_produces": row["optional_produces"] or [],
+        "source": row["source"] or "database",
+        "is_public": bool(row["is_public"]),
+    }
+
+
+def _filesystem_skills_metadata(names: List[str]) -> List[Dict[str, Any]]:
+    """Metadata for filesystem skills with the given names, taken from the loaded registry."""
+    from engine import SKILL_REGISTRY_BY_NAME
+    
+    skills = []
+    for name in names:
+        for s in SKILL_REGISTRY_BY_NAME.get(name, ()):
+            if not (s.module_name or "").startswith("fs."):
+                continue
+            skill_data = {
+                "name": s.name,
+                "description": s.description,
+                "executor": s.executor,
+                "enabled": True,
+                "source": "filesystem",
+            }
+            if s.action:
+                skill_data["action_config"] = s.action.model_dump(exclude_unset=True)
+            skills.append(skill_data)
+    return skills
 
 
 @api.get("/admin/skills")
-async def list_skills(current_user: AuthenticatedUser, workspace_id: Optional[str] = None):
-    """Get skills visible in the current workspace (filesystem + public + owned)."""
-    from skill_manager import get_all_skills_metadata
+async def list_skills(
+    current_user: AuthenticatedUser,
+    workspace_id: Optional[str] = None,
+    names: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Max skills to return (default: all)"),
+    offset: int = Query(0, ge=0, description="Skills to skip before the page"),
+):
+    """
+    Get skills visible in the current workspace (filesystem + public + owned).
     
+    Pass `names=a,b,c` to fetch only those skills (one database query for the batch).
+    Pass `limit`/`offset` to page through the list; `total` is the number of visible skills.
+    """
     try:
         workspace_service = get_workspace_service()
         workspace = await workspace_service.resolve_workspace(current_user.id, workspace_id)
-        skills = get_all_skills_metadata()
-        filtered = []
-        for s in skills:
-            source = s.get("source")
-            skill_ws = s.get("workspace_id")
-            is_public = s.get("is_public", False)
-            if source == "filesystem":
-                filtered.append(s)
-            elif is_public or skill_ws == workspace.id:
-                filtered.append(s)
-        return {"skills": filtered, "count": len(filtered), "workspace_id": workspace.id}
+        if names:
+            requested = list(dict.fromkeys(n.strip() for n in names.split(",") if n.strip()))
+            skills = await asyncio.to_thread(get_skills_metadata_batch, requested, workspace.id)
+            skills += _filesystem_skills_metadata(requested)
+        else:
+            # Visibility (owned, public or filesystem) is filtered in SQL
+            skills = await asyncio.to_thread(get_all_skills_metadata_batch, workspace.id)
+        total = len(skills)
+        if offset or limit is not None:
+            skills = skills[offset:None if limit is None else offset + limit]
+        payload = {"skills": skills, "count": len(skills), "total": total, "workspace_id": workspace.id}
+        if limit is not None:
+            payload["limit"] = limit
+            payload["offset"] = offset
+        return Response(content=orjson.dumps(payload), media_type="application/json")
     except HTTPException:
         raise
     except Exception as e:
@@ -118,157 +386,127 @@ async def list_skills(current_user: AuthenticatedUser, workspace_id: Optional[st
 
 
 @api.get("/admin/skills/{skill_identifier}")
-async def get_skill(skill_identifier: str, current_user: AuthenticatedUser, workspace_id: Optional[str] = None):
-    """Get detailed information about a specific skill by ID or name."""
-    from engine import SKILL_REGISTRY, get_skill_registry_for_workspace
-    from skill_manager import get_db_connection
-    import uuid
+async def get_skill(
+    skill_identifier: str,
+    current_user: AuthenticatedUser,
+    workspace_id: Optional[str] = None,
+    fresh: bool = False,
+):
+    """
+    Get detailed information about a specific skill by ID or name.
+    
+    Registry skills are served from the metadata cached at load time; pass
+    `fresh=true` to re-read the dynamic_skills row instead.
+    """
+    from engine import get_skill_for_workspace
     
     workspace_service = get_workspace_service()
-    workspace = await workspace_service.resolve_workspace(current_user.id, workspace_id)
+    resolving = None
+    if workspace_id:
+        # resolve_workspace only validates an explicit ID, so run it alongside the skill
+        # lookup below; _authorize() awaits it before anything is returned
+        resolving = asyncio.ensure_future(workspace_service.resolve_workspace(current_user.id, workspace_id))
+    else:
+        workspace_id = (await workspace_service.resolve_workspace(current_user.id, None)).id
+    
+    async def _authorize() -> str:
+        """Wait for the workspace check (raises its 404/403); returns the canonical workspace ID."""
+        if resolving is None:
+            return workspace_id
+        return (await resolving).id
     
-    # Determine if identifier is a UUID (ID) or a name
-    is_uuid = False
     try:
-        uuid.UUID(skill_identifier)
-        is_uuid = True
-    except (ValueError, AttributeError):
-        is_uuid = False
-    
-    # First check if skill is in the registry (enabled skills) and accessible
-    # Registry only has names, so if it's a UUID we need to look up in DB first
-    skill = None
-    skill_name_for_registry = None
-    
-    if not is_uuid:
-        # It's a name, check registry directly
-        registry = get_skill_registry_for_workspace(workspace.id)
-        skill = next((s for s in registry if s.name == skill_identifier), None)
-        skill_name_for_registry = skill_identifier
-    
-    # If not in registry or is UUID, check database directly (could be disabled or need name lookup)
-    if not skill:
-        try:
-            with get_db_connection() as conn:
-                with conn.cursor() as cur:
-                    if is_uuid:
-                        # Look up by ID
-                        cur.execute("""
-                            SELECT id::text, name, module_name, description, requires, produces, optional_produces,
-                                   executor, hitl_enabled, prompt, system_prompt, llm_model,
-                                   rest_config, action_config, action_code, action_functions,
-                                   source, enabled, created_at, updated_at,
-                                   workspace_id::text, owner_id::text, is_public
-                            FROM dynamic_skills
-                            WHERE id = %s
-                        """, (skill_identifier,))
-                    else:
-                        # Look up by name
-                        cur.execute("""
-                            SELECT id::text, name, module_name, description, requires, produces, optional_produces,
-                                   executor, hitl_enabled, prompt, system_prompt, llm_model,
-                                   rest_config, action_config, action_code, action_functions,
-                                   source, enabled, created_at, updated_at,
-                                   workspace_id::text, owner_id::text, is_public
-                            FROM dynamic_skills
-                            WHERE name = %s
-                        """, (skill_identifier,))
-                    
-                    row = cur.fetchone()
-                    
-                    if not row:
-                        raise HTTPException(status_code=404, detail=f"Skill not found")
-                    
-                    # Enforce workspace visibility
-                    is_public = bool(row[22])
-                    skill_workspace = row[20]
-                    if not is_public and skill_workspace and skill_workspace != workspace.id:
-                        raise HTTPException(status_code=404, detail=f"Skill not found")
-                    
-                    # Build skill dict from database row
-                    skill_dict = {
-                        "id": row[0],
-                        "name": row[1],
-                        "module_name": row[2],
-                        "description": row[3],
-                        "requires": row[4] or [],
-                        "produces": row[5] or [],
-                        "optional_produces": row[6] or [],
-                        "executor": row[7],
-                        "hitl_enabled": row[8],
-                        "prompt": row[9],
-                        "system_prompt": row[10],
-                        "llm_model": row[11],
-                        "rest_config": row[12],
-                        "action_config": row[13],
-                        "action_code": row[14],
-                        "action_functions": row[15],
-                        "source": row[16] or "database",
-                        "enabled": row[17],
-                        "created_at": row[18].isoformat() if row[18] else None,
-                        "updated_at": row[19].isoformat() if row[19] else None,
-                        "workspace_id": skill_workspace,
-                        "owner_id": row[21],
-                        "is_public": is_public,
-                    }
-                    
-                    return skill_dict
-        except HTTPException:
-            raise
-        except Exception as e:
-            print(f"[SKILLS_API] Error fetching skill from database: {e}")
-            raise HTTPException(status_code=404, detail=f"Skill not found")
+        # Repeat views of the same skill are served from memory until the registry changes
+        version = get_registry_version()
+        cache_key = None if fresh else (skill_identifier, workspace_id)
+        if cache_key is not None:
+            cached = _get_cached_skill_response(cache_key, version)
+            if cached is not None:
+                await _authorize()
+                return Response(content=cached, media_type="application/json")
+    
+        # Determine if identifier is a UUID (ID) or a name
+        is_uuid = _UUID_RE.fullmatch(skill_identifier) is not None
     
-    # Skill found in registry - get additional metadata from database if it's a database skill
-    source = "filesystem"
-    db_metadata = {}
+        # First check if skill is in the registry (enabled skills) and accessible
+        # Registry only has names, so if it's a UUID we need to look up in DB first
+        skill = None
     
-    # For registry skills, get the name for DB lookup
-    if skill:
-        skill_name_for_registry = skill.name
+        if not is_uuid:
+            # It's a name, check registry directly (O(1) name index)
+            skill = get_skill_for_workspace(skill_identifier, workspace_id)
     
-    if skill_name_for_registry:
+        # If not in registry or is UUID, check database directly (could be disabled or need name lookup)
+        if not skill:
+            # Look up by ID or by name, overlapping the workspace check
+            if is_uuid:
+                lookup_sql, lookup_params = _SKILL_FULL_SELECT["id"], (skill_identifier,)
+            else:
+                lookup_sql = _SKILL_FULL_SELECT_VISIBLE_BY_NAME
+                lookup_params = {"name": skill_identifier, "workspace_id": workspace_id}
+            row, authorized = await asyncio.gather(
+                asyncio.to_thread(_fetch_skill_row, lookup_sql, lookup_params, read_only=True, row_factory=dict_row),
+                _authorize(),
+                return_exceptions=True,
+            )
+            if isinstance(authorized, BaseException):
+                raise authorized
+            workspace_id = authorized
+            if isinstance(row, BaseException):
+                logger.error("[SKILLS_API] Error fetching skill from database", exc_info=row)
+                raise HTTPException(status_code=404, detail=f"Skill not found")
+        
+            if not row:
+                raise HTTPException(status_code=404, detail=f"Skill not found")
+        
+            # Enforce workspace visibility
+            if not row["is_public"] and row["workspace_id"] and row["workspace_id"] != workspace_id:
+                raise HTTPException(status_code=404, detail=f"Skill not found")
+        
+            return _skill_response(_skill_dict_from_full_row(row), cache_key, version)
+    
+        workspace_id = await _authorize()
+    finally:
+        # An early raise above (cache, registry or row lookup) leaves the check unawaited;
+        # cancel it if still running and collect its outcome so nothing leaks
+        if resolving is not None:
+            resolving.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await resolving
+    
+    # Skill found in registry - database metadata was cached on the skill at load time
+    source = skill.source
+    db_metadata = dict(skill.db_metadata or {})
+    
+    if fresh:
+        # Re-read the row: database skills by their unique module_name, others by name
+        lookup_column, lookup_value = (
+            ("module_name", skill.module_name) if skill.source == "database" else ("name", skill.name)
+        )
         try:
-            with get_db_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute("""
-                        SELECT id::text, source, enabled, created_at, updated_at, action_code, action_functions, module_name, workspace_id::text, owner_id::text, is_public
-                        FROM dynamic_skills
-                        WHERE name = %s
-                    """, (skill_name_for_registry,))
-                    row = cur.fetchone()
-                    if row:
-                        # Enforce workspace visibility
-                        is_public = bool(row[10])
-                        skill_workspace = row[8]
-                        if not is_public and skill_workspace and skill_workspace != workspace.id:
-                            raise HTTPException(status_code=404, detail=f"Skill not found")
-
-                        source = row[1] or "database"
-                        db_metadata = {
-                            "id": row[0],
-                            "enabled": row[2],
-                            "created_at": row[3].isoformat() if row[3] else None,
-                            "updated_at": row[4].isoformat() if row[4] else None,
-                            "action_code": row[5],
-                            "action_functions": row[6],
-                            "module_name": row[7],
-                            "workspace_id": skill_workspace,
-                            "owner_id": row[9],
-                            "is_public": is_public,
-                        }
-        except HTTPException:
-            raise
+            row = await asyncio.to_thread(
+                _fetch_skill_row, _SKILL_FULL_SELECT[lookup_column], (lookup_value,),
+                read_only=True, row_factory=dict_row,
+            )
         except Exception as e:
-            print(f"[SKILLS_API] Warning: Failed to check database for skill source: {e}")
+            logger.warning("[SKILLS_API] Failed to check database for skill source: %s", e)
+            row = None
+        if row:
+            # Enforce workspace visibility
+            if not row["is_public"] and row["workspace_id"] and row["workspace_id"] != workspace_id:
+                raise HTTPException(status_code=404, detail=f"Skill not found")
+            
+            row_dict = _skill_dict_from_full_row(row)
+            source = row_dict["source"]
+            db_metadata = {key: row_dict[key] for key in _DB_METADATA_KEYS}
     
     # Convert to dict with all fields
     skill_dict = {
         "name": skill.name,
         "description": skill.description,
-        "requires": list(skill.requires),
-        "produces": list(skill.produces),
-        "optional_produces": list(skill.optional_produces),
+        "requires": skill.requires,
+        "produces": skill.produces,
+        "optional_produces": skill.optional_produces,
         "executor": skill.executor,
         "hitl_enabled": skill.hitl_enabled,
         "prompt": skill.prompt,
@@ -307,40 +545,32 @@ async def get_skill(skill_identifier: str, current_user: AuthenticatedUser, work
         if skill.action.credential_ref:
             skill_dict["action_config"]["credential_ref"] = skill.action.credential_ref
     
-    return skill_dict
+    return _skill_response(skill_dict, cache_key, version)
 
 
 @api.post("/admin/skills")
 async def create_skill(skill: SkillCreateRequest, current_user: AuthenticatedUser):
     """Create a new skill in the database."""
-    from skill_manager import save_skill_to_database, reload_skill_registry
-    import psycopg
-    
     try:
         workspace_service = get_workspace_service()
         workspace = await workspace_service.resolve_workspace(current_user.id, skill.workspace_id)
 
         # Validate action_code if it's Python code (for action executor)
-        if skill.action_code and skill.executor == "action":
-            action_config = skill.action_config or {}
-            action_type = action_config.get("type", "")
-            
-            # Validate inline Python code (not data_pipeline YAML)
-            if action_type == "python":
-                validate_python_code(skill.action_code, "action_code")
+        action_code_hash = _maybe_validate_action_code(skill.action_code, skill.executor, skill.action_config)
         
         # Validate action_functions (transform functions for data pipelines)
         if skill.action_functions:
             validate_python_code(skill.action_functions, "action_functions")
         
-        skill_data = skill.dict()
+        skill_data = skill.model_dump()
+        # Record what was validated so later updates with unchanged code skip re-parsing it
+        skill_data["action_code_hash"] = action_code_hash
+        skill_data["action_functions_hash"] = _code_hash(skill.action_functions)
         skill_data["workspace_id"] = workspace.id
         skill_data["owner_id"] = current_user.id
         skill_data["is_public"] = skill.is_public
-        skill_id = save_skill_to_database(skill_data)
-        
-        # Reload registry to include new skill
-        count = reload_skill_registry()
+        # Insert and load into the registry together; the insert rolls back if the skill can't load
+        skill_id, count = await asyncio.to_thread(create_skill_and_load, skill_data)
         
         return {
             "status": "created",
@@ -368,13 +598,9 @@ async def create_skill(skill: SkillCreateRequest, current_user: AuthenticatedUse
 @api.put("/admin/skills/{skill_id}")
 async def update_skill(skill_id: str, updates: SkillUpdateRequest, current_user: AuthenticatedUser):
     """Update an existing skill in the database by ID."""
-    from skill_manager import save_skill_to_database, reload_skill_registry
-    import psycopg
-    from env_loader import load_env_once
-    from pathlib import Path
-    import os
-    
-    workspace_service = get_workspace_service()
+    # Malformed IDs can never match a row; reject them before touching the pool
+    if not _UUID_RE.fullmatch(skill_id):
+        raise HTTPException(status_code=422, detail="Invalid skill id")
     
     # STRICT: Prevent name changes during update
     if updates.name is not None:
@@ -384,110 +610,123 @@ async def update_skill(skill_id: str, updates: SkillUpdateRequest, current_user:
         )
     
     # Validate action_code if provided
-    if updates.action_code is not None and updates.executor == "action":
-        action_config = updates.action_config or {}
-        action_type = action_config.get("type", "")
-        
-        # Validate inline Python code (not data_pipeline YAML)
-        if action_type == "python":
-            validate_python_code(updates.action_code, "action_code")
+    sent_code_hash = _maybe_validate_action_code(updates.action_code, updates.executor, updates.action_config)
     
     # Validate action_functions if provided
+    sent_functions_hash = None
     if updates.action_functions is not None:
         validate_python_code(updates.action_functions, "action_functions")
-    
-    # Load current skill data from database
-    load_env_once(Path(__file__).resolve().parents[1])
-    db_uri = os.getenv("DATABASE_URL")
+        sent_functions_hash = _code_hash(updates.action_functions)
     
     try:
-        with psycopg.connect(db_uri) as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT name, module_name, description, requires, produces, optional_produces,
-                           executor, hitl_enabled, prompt, system_prompt, llm_model,
-                           rest_config, action_config, action_code, action_functions,
-                           workspace_id::text, owner_id::text, is_public, source
-                    FROM dynamic_skills
-                    WHERE id = %s
-                """, (skill_id,))
-                
-                row = cur.fetchone()
-                if not row:
-                    raise HTTPException(status_code=404, detail=f"Skill not found")
-                
-                # Build current skill data
-                current_data = {
-                    "name": row[0],
-                    "module_name": row[1],
-                    "description": row[2],
-                    "requires": row[3] or [],
-                    "produces": row[4] or [],
-                    "optional_produces": row[5] or [],
-                    "executor": row[6],
-                    "hitl_enabled": row[7],
-                    "prompt": row[8],
-                    "system_prompt": row[9],
-                    "llm_model": row[10],
-                    "rest_config": row[11],
-                    "action_config": row[12],
-                    "action_code": row[13],
-                    "action_functions": row[14],
-                    "workspace_id": row[15],
-                    "owner_id": row[16],
-                    "is_public": bool(row[17]),
-                    "source": row[18],
-                }
-                
-                # Verify it's a database skill
-                if current_data.get("source") != "database":
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Cannot update filesystem skill. Only database skills can be updated via API."
-                    )
-                
-                # Ownership enforcement (unless admin)
-                if not current_user.is_admin:
-                    owner_id = current_data.get("owner_id")
-                    if owner_id and owner_id != current_user.id:
-                        raise HTTPException(status_code=403, detail="Not authorized to update this skill")
-                
-                # Workspace verification
-                if current_data.get("workspace_id"):
-                    await workspace_service.resolve_workspace(current_user.id, current_data["workspace_id"])
-                
-                # Apply updates
-                update_dict = updates.dict(exclude_unset=True)
-                current_data.update(update_dict)
-                if updates.is_public is not None:
-                    current_data["is_public"] = updates.is_public
-                
-                # Validate the final merged action_code and action_functions
-                if current_data.get("action_code") and current_data.get("executor") == "action":
-                    action_config = current_data.get("action_config") or {}
-                    action_type = action_config.get("type", "")
-                    if action_type == "python":
-                        validate_python_code(current_data["action_code"], "action_code")
-                
-                if current_data.get("action_functions"):
-                    validate_python_code(current_data["action_functions"], "action_functions")
-                
-                # Add the ID to enable ID-based update in save_skill_to_database
-                current_data["id"] = skill_id
-                
-                # Save back to database using save_skill_to_database (with ID = UPDATE mode)
-                returned_id = save_skill_to_database(current_data)
-                
-                # Reload registry
-                count = reload_skill_registry()
-                
-                return {
-                    "status": "updated",
-                    "skill_id": returned_id,
-                    "name": current_data["name"],
-                    "total_skills": count,
-                    "message": f"Skill '{current_data['name']}' updated and reloaded successfully"
-                }
+        # Load current skill data and its workspace owner in one query
+        row = await asyncio.to_thread(_fetch_skill_row, _SKILL_UPDATE_SELECT, (skill_id,))
+        
+        if not row:
+            raise HTTPException(status_code=404, detail=f"Skill not found")
+        
+        # Build current skill data
+        current_data = {
+            "name": row[0],
+            "module_name": row[1],
+            "description": row[2],
+            "requires": row[3] or [],
+            "produces": row[4] or [],
+            "optional_produces": row[5] or [],
+            "executor": row[6],
+            "hitl_enabled": row[7],
+            "prompt": row[8],
+            "system_prompt": row[9],
+            "llm_model": row[10],
+            "rest_config": row[11],
+            "action_config": row[12],
+            "action_code": row[13],
+            "action_functions": row[14],
+            "workspace_id": row[15],
+            "owner_id": row[16],
+            "is_public": bool(row[17]),
+            "source": row[18],
+            "enabled": row[23],
+        }
+        
+        # Verify it's a database skill
+        if current_data.get("source") != "database":
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot update filesystem skill. Only database skills can be updated via API."
+            )
+        
+        # Optimistic concurrency: reject edits based on an older version of the skill
+        if updates.if_match_version is not None and updates.if_match_version != row[19]:
+            raise HTTPException(status_code=409, detail="Skill was modified concurrently")
+        
+        # Ownership enforcement (unless admin)
+        if not current_user.is_admin:
+            owner_id = current_data.get("owner_id")
+            if owner_id and owner_id != current_user.id:
+                raise HTTPException(status_code=403, detail="Not authorized to update this skill")
+        
+        # Workspace verification
+        _check_skill_workspace(current_data["workspace_id"], row[20], current_user.id)
+        
+        # Apply updates
+        update_dict = updates.model_dump(exclude_unset=True)
+        
+        # Re-submitting the stored values (e.g. saving an untouched form) writes nothing
+        if all(current_data.get(field) == value for field, value in update_dict.items() if field != "if_match_version"):
+            return {
+                "status": "unchanged",
+                "skill_id": skill_id,
+                "name": current_data["name"],
+                "version": row[19],
+                "total_skills": get_registry_skill_count(),
+                "message": f"Skill '{current_data['name']}' is unchanged"
+            }
+        
+        current_data.update(update_dict)
+        if updates.is_public is not None:
+            current_data["is_public"] = updates.is_public
+        
+        # Validate the final merged action_code and action_functions. Merged code is either
+        # what the client sent (validated above) or the stored code (hash saved at its last
+        # validation); a matching hash means it is already known to parse.
+        action_code_hash = _maybe_validate_action_code(
+            current_data.get("action_code"),
+            current_data.get("executor"),
+            current_data.get("action_config"),
+            sent_code_hash if sent_code_hash is not None else row[21],
+        )
+        
+        action_functions_hash = _code_hash(current_data.get("action_functions"))
+        if action_functions_hash is not None and action_functions_hash not in (sent_functions_hash, row[22]):
+            validate_python_code(current_data["action_functions"], "action_functions")
+        
+        # Write only the fields the client sent, in one UPDATE (no stale full-row overwrite)
+        write_fields = {
+            **update_dict,
+            "action_code_hash": action_code_hash,
+            "action_functions_hash": action_functions_hash,
+        }
+        updated = await asyncio.to_thread(
+            update_skill_fields, skill_id, current_data["module_name"], write_fields, updates.if_match_version
+        )
+        if not updated:
+            if updates.if_match_version is not None:
+                raise HTTPException(status_code=409, detail="Skill was modified concurrently")
+            raise HTTPException(status_code=404, detail=f"Skill not found")
+        returned_id, version = updated
+        
+        # Re-materialize just this skill in the registry
+        count = await asyncio.to_thread(reload_single_skill, returned_id)
+        
+        return {
+            "status": "updated",
+            "skill_id": returned_id,
+            "name": current_data["name"],
+            "version": version,
+            "total_skills": count,
+            "message": f"Skill '{current_data['name']}' updated and reloaded successfully"
+        }
     except psycopg.errors.UniqueViolation as e:
         # Handle duplicate skill name when renaming
         error_msg = str(e)
@@ -508,33 +747,46 @@ async def update_skill(skill_id: str, updates: SkillUpdateRequest, current_user:
 @api.delete("/admin/skills/{skill_id}")
 async def delete_skill(skill_id: str, current_user: AuthenticatedUser):
     """Delete a skill from the database by ID."""
-    from skill_manager import reload_skill_registry
-    import psycopg
-    from env_loader import load_env_once
-    from pathlib import Path
-    import os
-    
-    workspace_service = get_workspace_service()
+    # Malformed IDs can never match a row; reject them before touching the pool
+    if not _UUID_RE.fullmatch(skill_id):
+        raise HTTPException(status_code=422, detail="Invalid skill id")
     
-    # Load environment
-    load_env_once(Path(__file__).resolve().parents[1])
-    db_uri = os.getenv("DATABASE_URL")
+    pool = get_postgres_pool()
     
-    try:
-        with psycopg.connect(db_uri) as conn:
+    def _delete_skill():
+        # Happy path is a single round-trip: the checks live in the DELETE's WHERE clause
+        params = {"id": skill_id, "user_id": current_user.id, "is_admin": current_user.is_admin}
+        with pool.connection() as conn:
             with conn.cursor() as cur:
-                # Get skill details
                 cur.execute("""
-                    SELECT name, source, owner_id::text, workspace_id::text
-                    FROM dynamic_skills
-                    WHERE id = %s
+                    DELETE FROM dynamic_skills ds
+                    WHERE ds.id = %(id)s
+                      AND ds.source = 'database'
+                      AND (%(is_admin)s OR ds.owner_id IS NULL OR ds.owner_id::text = %(user_id)s)
+                      AND (ds.workspace_id IS NULL OR EXISTS (
+                          SELECT 1 FROM workspaces w
+                          WHERE w.id = ds.workspace_id AND w.user_id::text = %(user_id)s
+                      ))
+                    RETURNING ds.name
+                """, params, prepare=True)
+                
+                row = cur.fetchone()
+                if row:
+                    return row[0]
+                
+                # Nothing deleted: look the skill up only now to report why
+                cur.execute("""
+                    SELECT ds.name, ds.source, ds.owner_id::text, ds.workspace_id::text, w.user_id::text
+                    FROM dynamic_skills ds
+                    LEFT JOIN workspaces w ON w.id = ds.workspace_id
+                    WHERE ds.id = %s
                 """, (skill_id,))
                 
                 row = cur.fetchone()
                 if not row:
                     raise HTTPException(status_code=404, detail=f"Skill not found")
                 
-                skill_name, source, owner_id, workspace_id = row
+                skill_name, source, owner_id, workspace_id, workspace_owner_id = row
                 
                 # Verify it's a database skill
                 if source != "database":
@@ -549,20 +801,16 @@ async def delete_skill(skill_id: str, current_user: AuthenticatedUser):
                         raise HTTPException(status_code=403, detail="Not authorized to delete this skill")
                 
                 # Workspace verification
-                if workspace_id:
-                    await workspace_service.resolve_workspace(current_user.id, workspace_id)
-                
-                # Delete the skill by ID
-                cur.execute("DELETE FROM dynamic_skills WHERE id = %s RETURNING name", (skill_id,))
-                result = cur.fetchone()
-                if not result:
-                    raise HTTPException(status_code=404, detail=f"Skill not found")
+                _check_skill_workspace(workspace_id, workspace_owner_id, current_user.id)
                 
-                deleted_name = result[0]
-                conn.commit()
+                # Checks pass now, so the row changed under us between the two statements
+                raise HTTPException(status_code=409, detail="Skill was modified concurrently, please retry")
+    
+    try:
+        deleted_name = await asyncio.to_thread(_delete_skill)
         
-        # Reload registry
-        count = reload_skill_registry()
+        # Drop just this skill from the registry
+        count = await asyncio.to_thread(unload_skill, skill_id)
         
         return {
             "status": "deleted",
@@ -578,14 +826,31 @@ async def delete_skill(skill_id: str, current_user: AuthenticatedUser):
 
 
 @api.post("/admin/skills/reload")
-async def reload_skills(current_user: AuthenticatedUser, workspace_id: Optional[str] = None):
-    """Reload skills for the current workspace (hot-reload)."""
-    from skill_manager import reload_skill_registry
+async def reload_skills(
+    current_user: AuthenticatedUser,
+    background_tasks: BackgroundTasks,
+    workspace_id: Optional[str] = None,
+    wait: bool = True,
+):
+    """
+    Reload skills for the current workspace (hot-reload).
     
+    With `wait=false` the reload is queued after the response instead, coalesced with
+    any other pending background reload; `total_skills` is then the current registry size.
+    """
     try:
         workspace_service = get_workspace_service()
         workspace = await workspace_service.resolve_workspace(current_user.id, workspace_id)
-        count = reload_skill_registry(workspace_id=workspace.id, include_public=True)
+        if not wait:
+            background_tasks.add_task(request_registry_reload)
+            count = get_registry_skill_count()
+            return {
+                "status": "scheduled",
+                "total_skills": count,
+                "workspace_id": workspace.id,
+                "message": f"Skill reload scheduled for workspace {workspace.name}"
+            }
+        count = await asyncio.to_thread(reload_skill_registry, workspace_id=workspace.id, include_public=True)
         return {
             "status": "reloaded",
             "total_skills": count,
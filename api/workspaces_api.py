@@ -4,12 +4,12 @@ Workspace management endpoints.
 Scopes skills and runs per user workspace and supports switching with skill re-registration.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 from pydantic import BaseModel
 
 from services.auth_middleware import AuthenticatedUser
 from services.workspace_service import get_workspace_service
-from skill_manager import reload_skill_registry
+from skill_manager import get_registry_skill_count, request_registry_reload
 
 
 router = APIRouter(prefix="/workspaces", tags=["Workspaces"])
@@ -32,7 +32,7 @@ async def list_workspaces(current_user: AuthenticatedUser):
     workspaces = await service.list_workspaces(current_user.id)
     default_ws = next((ws for ws in workspaces if ws.is_default), None)
     return {
-        "workspaces": [ws.dict() for ws in workspaces],
+        "workspaces": [ws.model_dump() for ws in workspaces],
         "default_workspace_id": default_ws.id if default_ws else None,
     }
 
@@ -44,20 +44,27 @@ async def create_workspace(req: WorkspaceCreateRequest, current_user: Authentica
     workspace = await service.create_workspace(current_user.id, req.name)
     if req.make_default:
         workspace = await service.set_default(current_user.id, workspace.id)
-    return {"workspace": workspace.dict()}
+    return {"workspace": workspace.model_dump()}
 
 
 @router.post("/switch")
-async def switch_workspace(req: WorkspaceSwitchRequest, current_user: AuthenticatedUser):
+async def switch_workspace(
+    req: WorkspaceSwitchRequest,
+    current_user: AuthenticatedUser,
+    background_tasks: BackgroundTasks,
+):
     """
     Switch active workspace (validates ownership) and reload skills for that scope.
+    
+    The reload runs after the response is sent; `skills_loaded` is the current registry size.
     """
     service = get_workspace_service()
     target = await service.resolve_workspace(current_user.id, req.workspace_id)
     if req.set_default:
         target = await service.set_default(current_user.id, target.id)
 
-    # Re-register skills (reload all and rely on workspace filters at runtime)
-    skills_count = reload_skill_registry()
+    # Re-register skills (reload all and rely on workspace filters at runtime); rapid
+    # switches share one coalesced background reload
+    background_tasks.add_task(request_registry_reload)
 
-    return {"workspace": target.dict(), "skills_loaded": skills_count}
+    return {"workspace": target.model_dump(), "skills_loaded": get_registry_skill_count()}
@@ -1,22 +1,24 @@
 from __future__ import annotations
 
+import logging
 import os
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-from dotenv import load_dotenv
 from env_loader import load_env_once
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient, MongoClient
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.collection import Collection
 from pymongo.database import Database
 
 _PROJECT_ROOT = Path(__file__).resolve().parents[1]
 # Load env files once at import; shared utility for reuse across modules.
 _loaded_paths = load_env_once(_PROJECT_ROOT)
-mongo_db = os.getenv("MONGODB_DB", "").strip()
-print(f"[mongo.py] env loaded: MONGODB_DB={'(empty)' if not mongo_db else mongo_db}")
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -25,16 +27,6 @@ class MongoSettings:
     db_name: str
 
 
-@lru_cache(maxsize=1)
-def _get_settings() -> MongoSettings:
-    """Return Mongo settings pulled from environment variables."""
-
-    return MongoSettings(
-        uri=_get_env_value("MONGODB_URI", "mongodb://localhost:27017"),
-        db_name=_get_env_value("MONGODB_DB", "clearstar"),
-    )
-
-
 def _get_env_value(key: str, default: str) -> str:
     """Fetch an env var and fall back when unset or blank."""
 
@@ -44,6 +36,24 @@ def _get_env_value(key: str, default: str) -> str:
     return value.strip()
 
 
+# Resolved right after the env files load; later reads are plain attribute lookups.
+SETTINGS = MongoSettings(
+    uri=_get_env_value("MONGODB_URI", "mongodb://localhost:27017"),
+    db_name=_get_env_value("MONGODB_DB", "clearstar"),
+)
+if logger.isEnabledFor(logging.DEBUG):
+    logger.debug("[mongo.py] MongoDB db=%s", SETTINGS.db_name)
+
+
+def _client_options() -> dict[str, Any]:
+    """Pool settings shared with services.connection_pool, or driver defaults if it is unavailable."""
+    try:
+        from services.connection_pool import get_mongo_config
+    except ImportError:
+        return {}
+    return get_mongo_config()
+
+
 @lru_cache(maxsize=1)
 def _get_client() -> MongoClient[Any]:
     """
@@ -58,16 +68,9 @@ def _get_client() -> MongoClient[Any]:
         from services.connection_pool import get_mongo_client
         return get_mongo_client()
     except (ImportError, RuntimeError):
-        # Fallback to legacy direct connection
-        settings = _get_settings()
-        # Use connection pooling settings for legacy mode
-        return MongoClient(
-            settings.uri,
-            maxPoolSize=20,
-            minPoolSize=5,
-            maxIdleTimeMS=300000,
-            waitQueueTimeoutMS=30000,
-        )
+        # Fallback to legacy direct connection with the same pool settings;
+        # connect=False defers the handshake to the first query
+        return MongoClient(SETTINGS.uri, connect=False, **_client_options())
 
 
 def get_client() -> MongoClient[Any]:
@@ -76,11 +79,17 @@ def get_client() -> MongoClient[Any]:
     return _get_client()
 
 
+# Resolved Database handle; set on first get_db() so later calls skip both cached lookups
+_DB: Database[Any] | None = None
+
+
 def get_db() -> Database[Any]:
     """Return the configured MongoDB database."""
 
-    settings = _get_settings()
-    return _get_client()[settings.db_name]
+    global _DB
+    if _DB is None:
+        _DB = _get_client()[SETTINGS.db_name]
+    return _DB
 
 
 def get_collection(name: str) -> Collection[Any]:
@@ -89,4 +98,67 @@ def get_collection(name: str) -> Collection[Any]:
     if not name:
         raise ValueError("Collection name must be provided")
 
-    return get_db()[name]
\ No newline at end of file
+    return _get_collection_cached(name)
+
+
+@lru_cache(maxsize=None)
+def _get_collection_cached(name: str) -> Collection[Any]:
+    """Collection handles are cheap and thread-safe, so one per name is reused."""
+
+    return get_db()[name]
+
+
+@lru_cache(maxsize=1)
+def _get_async_client() -> AsyncMongoClient[Any]:
+    """
+    Return a singleton asyncio MongoDB client for use inside async handlers.
+
+    Uses PyMongo's native async API (the successor to Motor), so awaiting a
+    query yields to the event loop instead of blocking a threadpool worker.
+    """
+    return AsyncMongoClient(SETTINGS.uri, **_client_options())
+
+
+def get_async_client() -> AsyncMongoClient[Any]:
+    """Public accessor for the shared asyncio Mongo client instance."""
+
+    return _get_async_client()
+
+
+# Resolved async Database handle, same single-lookup pattern as _DB
+_ASYNC_DB: AsyncDatabase[Any] | None = None
+
+
+def get_async_db() -> AsyncDatabase[Any]:
+    """Async counterpart of get_db for use inside async handlers."""
+
+    global _ASYNC_DB
+    if _ASYNC_DB is None:
+        _ASYNC_DB = _get_async_client()[SETTINGS.db_name]
+    return _ASYNC_DB
+
+
+def get_async_collection(name: str) -> AsyncCollection[Any]:
+    """Async counterpart of get_collection for use with `await`."""
+
+    if not name:
+        raise ValueError("Collection name must be provided")
+
+    return get_async_db()[name]
+
+
+def _reset_after_fork() -> None:
+    """Drop clients inherited from the parent so each forked worker opens its own sockets."""
+
+    global _DB, _ASYNC_DB
+    _DB = None
+    _ASYNC_DB = None
+    _get_collection_cached.cache_clear()
+    _get_client.cache_clear()
+    _get_async_client.cache_clear()
+
+
+# Per-process singletons: pre-fork servers (gunicorn with preload_app) must not share
+# the parent's Mongo sockets. Not available on Windows, which does not fork.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
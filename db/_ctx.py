@@ -0,0 +1,53 @@
+"""
+Shared connection setup for the standalone db/ scripts.
+
+Loads the project env files once, checks DATABASE_URL, and opens connections
+with TCP keepalives so long-running DDL over a remote link is not dropped by
+idle timeouts in between statements.
+"""
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+import psycopg
+
+from env_loader import load_env_once
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+T = TypeVar("T")
+
+
+def get_database_url() -> str:
+    """Load env files and return DATABASE_URL, exiting with an error if it is not set."""
+    load_env_once(_PROJECT_ROOT)
+    db_uri = os.getenv("DATABASE_URL")
+    if not db_uri:
+        print("ERROR: DATABASE_URL not set in environment")
+        sys.exit(1)
+    return db_uri
+
+
+def connect(db_uri: Optional[str] = None, *, autocommit: bool = True, **kwargs: Any) -> psycopg.Connection:
+    """Open a script connection (extra kwargs go to psycopg.connect)."""
+    return psycopg.connect(
+        db_uri or get_database_url(),
+        autocommit=autocommit,
+        keepalives=1,
+        keepalives_idle=30,
+        **kwargs,
+    )
+
+
+def run_with_cursor(
+    fn: Callable[[psycopg.Cursor], T],
+    db_uri: Optional[str] = None,
+    *,
+    autocommit: bool = True,
+    **kwargs: Any,
+) -> T:
+    """Run `fn(cursor)` on a fresh connection and return its result."""
+    with connect(db_uri, autocommit=autocommit, **kwargs) as conn:
+        with conn.cursor() as cur:
+            return fn(cur)
@@ -0,0 +1,29 @@
+-- Migration: Indexes for the admin Run Manager list (api/run_manager_api.py)
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Keyset pagination: ORDER BY created_at DESC NULLS LAST, thread_id DESC
+-- with WHERE (created_at, thread_id) < (cursor) becomes an index range scan
+CREATE INDEX IF NOT EXISTS idx_run_metadata_created_at_thread_id
+ON run_metadata (created_at DESC NULLS LAST, thread_id DESC);
+
+-- Workspace filter, already in list order
+CREATE INDEX IF NOT EXISTS idx_run_metadata_workspace_created
+ON run_metadata (workspace_id, created_at DESC NULLS LAST);
+
+-- Username filter (u.username = %s resolves to a user_id, then reads in list order)
+CREATE INDEX IF NOT EXISTS idx_run_metadata_user_created
+ON run_metadata (user_id, created_at DESC NULLS LAST);
+
+-- Substring search: thread_id ILIKE '%...%' OR run_name ILIKE '%...%'
+CREATE INDEX IF NOT EXISTS idx_run_metadata_thread_id_trgm
+ON run_metadata USING GIN (thread_id gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_run_metadata_run_name_trgm
+ON run_metadata USING GIN (run_name gin_trgm_ops);
+
+COMMENT ON INDEX idx_run_metadata_created_at_thread_id IS 'Keyset pagination for the run manager list (created_at, thread_id cursor)';
+COMMENT ON INDEX idx_run_metadata_workspace_created IS 'Run manager list filtered by workspace, newest first';
+COMMENT ON INDEX idx_run_metadata_user_created IS 'Run manager list filtered by user, newest first';
+COMMENT ON INDEX idx_run_metadata_thread_id_trgm IS 'Trigram index for ILIKE search on thread_id';
+COMMENT ON INDEX idx_run_metadata_run_name_trgm IS 'Trigram index for ILIKE search on run_name';
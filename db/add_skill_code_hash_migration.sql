@@ -0,0 +1,13 @@
+-- Migration: Store hashes of validated skill code on dynamic_skills
+-- The skills API writes SHA-256 digests of action_code (when validated as Python) and
+-- action_functions. Updates that leave the code unchanged compare digests and skip
+-- re-parsing it.
+
+ALTER TABLE dynamic_skills
+ADD COLUMN IF NOT EXISTS action_code_hash BYTEA,
+ADD COLUMN IF NOT EXISTS action_functions_hash BYTEA;
+
+COMMENT ON COLUMN dynamic_skills.action_code_hash IS
+'SHA-256 of action_code as last validated as Python (NULL if not validated)';
+COMMENT ON COLUMN dynamic_skills.action_functions_hash IS
+'SHA-256 of action_functions as last validated (NULL if not validated)';
@@ -0,0 +1,9 @@
+-- Migration: Add optimistic-concurrency version column to dynamic_skills
+-- Every update bumps the version; PUT /admin/skills/{id} with if_match_version
+-- only applies when the row is still at the version the client read.
+
+ALTER TABLE dynamic_skills
+ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+
+COMMENT ON COLUMN dynamic_skills.version IS
+'Row version for optimistic concurrency (incremented on every update)';
@@ -0,0 +1,12 @@
+-- Migration: Index for workspace-visible skill listings
+-- list_skills filters in SQL with
+--   WHERE workspace_id = $1 OR is_public = true OR source = 'filesystem' ORDER BY name
+-- The workspace branch is served by the dynamic_skills_workspace_name_key UNIQUE (workspace_id, name)
+-- index and the source branch by idx_dynamic_skills_source; this adds the public branch so
+-- PostgreSQL can BitmapOr all three instead of scanning the table.
+
+-- Public skills are usually a small subset, so a partial index stays tiny
+CREATE INDEX IF NOT EXISTS idx_dynamic_skills_public_name ON dynamic_skills(name)
+WHERE is_public = true;
+
+COMMENT ON INDEX idx_dynamic_skills_public_name IS 'Partial index over public skills (list_skills visibility filter)';
@@ -6,6 +6,7 @@ and adds user_id tracking to run_metadata and logs tables.
 """
 
 import os
+import secrets
 import sys
 from pathlib import Path
 
@@ -13,6 +14,7 @@ from pathlib import Path
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
 
+import bcrypt
 import psycopg
 from env_loader import load_env_once
 
@@ -24,6 +26,9 @@ if not DB_URI:
     print("ERROR: DATABASE_URL not set in environment")
     sys.exit(1)
 
+# bcrypt cost for the generated system password (12 = bcrypt default; dev setups can lower it)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
 
 def apply_schema(db_uri: str):
     """Apply user management schema and migrations"""
@@ -33,13 +38,13 @@ def apply_schema(db_uri: str):
         with conn.cursor() as cur:
             # Apply users schema
             print("[DB] Creating users tables...")
-            users_schema = (project_root / "db" / "users_schema.sql").read_text()
+            users_schema = (project_root / "db" / "users_schema.sql").read_bytes().decode("utf-8")
             cur.execute(users_schema)
             print("[DB] ✓ Users tables created")
             
             # Apply user tracking migration
             print("[DB] Adding user tracking to existing tables...")
-            migration = (project_root / "db" / "add_user_tracking_migration.sql").read_text()
+            migration = (project_root / "db" / "add_user_tracking_migration.sql").read_bytes().decode("utf-8")
             cur.execute(migration)
             print("[DB] ✓ User tracking added")
             
@@ -50,11 +55,8 @@ def apply_schema(db_uri: str):
             """)
             if not cur.fetchone():
                 # Generate a random password (should be changed immediately)
-                import secrets
-                import bcrypt
-                
                 default_password = secrets.token_urlsafe(16)
-                salt = bcrypt.gensalt()
+                salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
                 hashed = bcrypt.hashpw(default_password.encode('utf-8'), salt)
                 
                 cur.execute("""
@@ -9,63 +9,92 @@ WARNING: This permanently deletes ALL workflow data!
 
 Use this to start fresh during development.
 DO NOT run this in production without backups!
+
+Usage:
+    python db/cleanup_all_runs.py               # interactive confirmation
+    python db/cleanup_all_runs.py --yes         # no prompt (CI, cron, test fixtures)
+    python db/cleanup_all_runs.py --stats-only  # only print the current counts
+    python db/cleanup_all_runs.py --exact       # exact COUNT(*) instead of planner estimates
 """
-import os
+import argparse
 import sys
 from pathlib import Path
 
 # Add parent directory to path to import env_loader
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from env_loader import load_env_once
-import psycopg
+from db._ctx import connect, get_database_url
 
 
-def show_counts(cur):
-    """Display current record counts."""
-    cur.execute("SELECT COUNT(*) FROM checkpoints")
-    checkpoint_count = cur.fetchone()[0]
-    
-    cur.execute("SELECT COUNT(*) FROM thread_logs")
-    log_count = cur.fetchone()[0]
+_RUN_TABLES = ("checkpoints", "thread_logs", "checkpoint_blobs", "checkpoint_writes")
+
+
+def show_counts(cur, exact: bool = True):
+    """
+    Display current record counts.
     
-    cur.execute("SELECT COUNT(*) FROM checkpoint_blobs")
-    blob_count = cur.fetchone()[0]
+    With exact=False, returns the planner's row estimates from pg_class (no table
+    scans; may lag until the next VACUUM/ANALYZE).
+    """
+    if not exact:
+        cur.execute("""
+            SELECT relname, GREATEST(reltuples, 0)::bigint
+            FROM pg_class
+            WHERE relname = ANY(%s) AND relkind = 'r' AND pg_table_is_visible(oid)
+        """, (list(_RUN_TABLES),))
+        estimates = dict(cur.fetchall())
+        return tuple(estimates.get(table, 0) for table in _RUN_TABLES)
     
-    cur.execute("SELECT COUNT(*) FROM checkpoint_writes")
-    write_count = cur.fetchone()[0]
+    # All four counts in one round-trip
+    cur.execute("""
+        SELECT
+            (SELECT COUNT(*) FROM checkpoints),
+            (SELECT COUNT(*) FROM thread_logs),
+            (SELECT COUNT(*) FROM checkpoint_blobs),
+            (SELECT COUNT(*) FROM checkpoint_writes)
+    """)
+    checkpoint_count, log_count, blob_count, write_count = cur.fetchone()
     
     return checkpoint_count, log_count, blob_count, write_count
 
 
-def cleanup_database():
-    """Clean up all workflow runs and logs."""
+def has_runs(cur) -> bool:
+    """Whether any checkpoints or thread logs exist (stops at the first row)."""
+    cur.execute("SELECT EXISTS (SELECT 1 FROM checkpoints) OR EXISTS (SELECT 1 FROM thread_logs)")
+    return cur.fetchone()[0]
+
+
+def cleanup_database(assume_yes: bool = False, stats_only: bool = False, exact: bool = False):
+    """
+    Clean up all workflow runs and logs.
+    
+    Args:
+        assume_yes: Skip the interactive 'DELETE ALL' confirmation
+        stats_only: Only print the current record counts, delete nothing
+        exact: Show exact counts instead of planner estimates before deleting
+    """
     print("\n" + "="*60)
-    print("DATABASE CLEANUP - REMOVE ALL RUNS AND LOGS")
+    print("DATABASE CLEANUP - REMOVE ALL RUNS AND LOGS" if not stats_only else "DATABASE STATE - RUNS AND LOGS")
     print("="*60)
     
-    # Load environment variables
-    load_env_once(Path(__file__).resolve().parent.parent)
-    
-    db_uri = os.getenv("DATABASE_URL")
-    if not db_uri:
-        print("\n✗ ERROR: DATABASE_URL not set in environment")
-        sys.exit(1)
+    db_uri = get_database_url()
     
-    print("\n⚠️  WARNING: This will permanently delete:")
-    print("   • All workflow runs (checkpoints)")
-    print("   • All execution history")
-    print("   • All thread logs")
-    print("   • All pending writes and blobs")
+    if not stats_only:
+        print("\n⚠️  WARNING: This will permanently delete:")
+        print("   • All workflow runs (checkpoints)")
+        print("   • All execution history")
+        print("   • All thread logs")
+        print("   • All pending writes and blobs")
     
     try:
-        with psycopg.connect(db_uri, autocommit=True) as conn:
+        # prepare_threshold=1: with --exact the show_counts query runs twice, so its second run is prepared
+        with connect(db_uri, prepare_threshold=1) as conn:
             with conn.cursor() as cur:
-                # Show current state
-                checkpoint_count, log_count, blob_count, write_count = show_counts(cur)
+                # Show current state (planner estimates unless --exact)
+                checkpoint_count, log_count, blob_count, write_count = show_counts(cur, exact=exact)
                 
                 print("\n" + "="*60)
-                print("Current database state:")
+                print("Current database state:" if exact else "Current database state (estimated, --exact for exact counts):")
                 print("="*60)
                 print(f"  Checkpoints:       {checkpoint_count:,}")
                 print(f"  Thread logs:       {log_count:,}")
@@ -73,36 +102,37 @@ def cleanup_database():
                 print(f"  Checkpoint writes: {write_count:,}")
                 print("="*60)
                 
-                if checkpoint_count == 0 and log_count == 0:
+                if stats_only:
+                    return
+                
+                # Estimates can lag behind inserts, so confirm emptiness with a cheap probe
+                if (checkpoint_count == 0 and log_count == 0) if exact else not has_runs(cur):
                     print("\n✓ Database is already clean!")
                     return
                 
                 # Confirmation
-                print("\n⚠️  Are you sure you want to delete ALL this data?")
-                response = input("Type 'DELETE ALL' to confirm (or anything else to cancel): ")
-                
-                if response.strip() != "DELETE ALL":
-                    print("\n✓ Cleanup cancelled. No data was deleted.")
-                    return
+                if not assume_yes:
+                    if not sys.stdin.isatty():
+                        # Never delete unattended without an explicit --yes
+                        print("\n✗ No terminal to confirm on; pass --yes to delete non-interactively.")
+                        print("✓ Cleanup cancelled. No data was deleted.")
+                        return
+                    print("\n⚠️  Are you sure you want to delete ALL this data?")
+                    response = input("Type 'DELETE ALL' to confirm (or anything else to cancel): ")
+                    
+                    if response.strip() != "DELETE ALL":
+                        print("\n✓ Cleanup cancelled. No data was deleted.")
+                        return
                 
                 print("\n🗑️  Deleting all records...")
                 
-                # Delete in correct order (respecting foreign keys)
-                print("  • Deleting checkpoint writes...")
-                cur.execute("TRUNCATE TABLE checkpoint_writes CASCADE")
-                
-                print("  • Deleting checkpoint blobs...")
-                cur.execute("TRUNCATE TABLE checkpoint_blobs CASCADE")
-                
-                print("  • Deleting checkpoints...")
-                cur.execute("TRUNCATE TABLE checkpoints CASCADE")
-                
-                print("  • Deleting thread logs...")
-                cur.execute("TRUNCATE TABLE thread_logs")
-                
-                # Reset sequences
-                print("  • Resetting sequences...")
-                cur.execute("ALTER SEQUENCE IF EXISTS thread_logs_id_seq RESTART WITH 1")
+                # One multi-table TRUNCATE: a single lock phase, atomic for readers;
+                # RESTART IDENTITY resets thread_logs_id_seq (owned by thread_logs.id)
+                print("  • Deleting checkpoint writes, blobs, checkpoints and thread logs...")
+                cur.execute(
+                    "TRUNCATE TABLE checkpoint_writes, checkpoint_blobs, checkpoints, thread_logs "
+                    "RESTART IDENTITY CASCADE"
+                )
                 
                 # Verify cleanup
                 checkpoint_count, log_count, blob_count, write_count = show_counts(cur)
@@ -123,5 +153,10 @@ def cleanup_database():
 
 
 if __name__ == "__main__":
-    cleanup_database()
+    parser = argparse.ArgumentParser(description="Remove all workflow runs and logs from the database.")
+    parser.add_argument("--yes", action="store_true", help="Delete without the interactive confirmation")
+    parser.add_argument("--stats-only", action="store_true", help="Only show current record counts")
+    parser.add_argument("--exact", action="store_true", help="Show exact counts (full scans) instead of planner estimates")
+    args = parser.parse_args()
+    cleanup_database(assume_yes=args.yes, stats_only=args.stats_only, exact=args.exact)
 
@@ -6,108 +6,103 @@ This script updates the action_config.module field in dynamic_skills
 to use the correct module_name instead of the raw skill name.
 
 Usage:
-    python db/fix_module_paths.py
+    python db/fix_module_paths.py            # one UPDATE ... RETURNING
+    python db/fix_module_paths.py --verbose  # also list every skill's path first
+
+The UPDATE filters on executor and action_config->>'type'; if dynamic_skills grows
+large, a partial index keeps it from scanning the whole table:
+    CREATE INDEX IF NOT EXISTS dynamic_skills_pyfunc ON dynamic_skills (name)
+    WHERE executor = 'action' AND action_config->>'type' = 'python_function';
 """
 
-import os
+import argparse
 import sys
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from env_loader import load_env_once
-import psycopg
+from db._ctx import connect, get_database_url
 
 
-def fix_module_paths():
-    """Fix module paths for all python_function action skills."""
+def fix_module_paths(verbose: bool = False):
+    """
+    Fix module paths for all python_function action skills.
+    
+    Args:
+        verbose: List every python_function skill's current path before fixing
+    """
     print("\n" + "="*70)
     print("Fix Module Paths in Dynamic Skills")
     print("="*70)
     
-    # Load environment
-    load_env_once(Path(__file__).resolve().parent.parent)
-    db_uri = os.getenv("DATABASE_URL")
-    
-    if not db_uri:
-        print("❌ ERROR: DATABASE_URL not set in environment")
-        sys.exit(1)
+    db_uri = get_database_url()
     
     try:
-        with psycopg.connect(db_uri) as conn:
+        with connect(db_uri, autocommit=False) as conn:
             with conn.cursor() as cur:
-                # Check current state
-                print("\n[1/3] Checking current skills...")
-                cur.execute("""
-                    SELECT 
-                        name,
-                        module_name,
-                        action_config->>'module' as current_module,
-                        action_config->>'function' as function_name
-                    FROM dynamic_skills
-                    WHERE executor = 'action'
-                      AND action_config->>'type' = 'python_function'
-                    ORDER BY name
-                """)
-                
-                skills = cur.fetchall()
+                if verbose:
+                    # Check current state
+                    print("\n[1/3] Checking current skills...")
+                    cur.execute("""
+                        SELECT 
+                            name,
+                            module_name,
+                            action_config->>'module' as current_module,
+                            action_config->>'function' as function_name
+                        FROM dynamic_skills
+                        WHERE executor = 'action'
+                          AND action_config->>'type' = 'python_function'
+                        ORDER BY name
+                    """)
+                    
+                    skills = cur.fetchall()
+                    
+                    if not skills:
+                        print("  ℹ️  No python_function skills found")
+                        return
+                    
+                    print(f"  Found {len(skills)} python_function skills:")
+                    needs_fix = []
+                    for name, module_name, current_module, function_name in skills:
+                        expected_module = f"dynamic_skills.{module_name}"
+                        status = "✓" if current_module == expected_module else "✗"
+                        print(f"    {status} {name}")
+                        print(f"       Module: {current_module or '(not set)'}")
+                        print(f"       Expected: {expected_module}")
+                        if current_module != expected_module:
+                            needs_fix.append((name, module_name, current_module, expected_module))
+                    
+                    if not needs_fix:
+                        print("\n✓ All skills already have correct module paths!")
+                        return
                 
-                if not skills:
-                    print("  ℹ️  No python_function skills found")
-                    return
-                
-                print(f"  Found {len(skills)} python_function skills:")
-                needs_fix = []
-                for name, module_name, current_module, function_name in skills:
-                    expected_module = f"dynamic_skills.{module_name}"
-                    status = "✓" if current_module == expected_module else "✗"
-                    print(f"    {status} {name}")
-                    print(f"       Module: {current_module or '(not set)'}")
-                    print(f"       Expected: {expected_module}")
-                    if current_module != expected_module:
-                        needs_fix.append((name, module_name, current_module, expected_module))
-                
-                if not needs_fix:
-                    print("\n✓ All skills already have correct module paths!")
-                    return
-                
-                # Fix the skills
-                print(f"\n[2/3] Fixing {len(needs_fix)} skills...")
+                # Fix the skills; RETURNING reports the new paths, so no re-scan to verify
+                print("\n[2/3] Fixing skills...")
                 cur.execute("""
                     UPDATE dynamic_skills
-                    SET action_config = jsonb_set(
-                        action_config,
-                        '{module}',
-                        to_jsonb('dynamic_skills.' || module_name)
-                    )
+                    -- One merge; further keys can join the same jsonb_build_object
+                    SET action_config = action_config || jsonb_build_object('module', 'dynamic_skills.' || module_name)
                     WHERE executor = 'action'
                       AND action_config->>'type' = 'python_function'
                       AND (
                           action_config->>'module' != 'dynamic_skills.' || module_name
                           OR action_config->>'module' IS NULL
                       )
+                    RETURNING name, module_name, action_config->>'module' AS new_module
                 """)
                 
-                updated_count = cur.rowcount
+                updated = sorted(cur.fetchall(), key=lambda row: row[0])
                 conn.commit()
-                print(f"  ✓ Updated {updated_count} skills")
+                if not updated:
+                    print("\n✓ All skills already have correct module paths!")
+                    return
+                print(f"  ✓ Updated {len(updated)} skills")
                 
                 # Verify
                 print("\n[3/3] Verifying fixes...")
-                cur.execute("""
-                    SELECT 
-                        name,
-                        module_name,
-                        action_config->>'module' as current_module
-                    FROM dynamic_skills
-                    WHERE executor = 'action'
-                      AND action_config->>'type' = 'python_function'
-                    ORDER BY name
-                """)
-                
                 all_correct = True
-                for name, module_name, current_module in cur.fetchall():
+                for name, module_name, current_module in updated:
                     expected_module = f"dynamic_skills.{module_name}"
                     if current_module == expected_module:
                         print(f"  ✓ {name}: {current_module}")
@@ -136,7 +131,10 @@ def fix_module_paths():
 
 if __name__ == "__main__":
     try:
-        fix_module_paths()
+        parser = argparse.ArgumentParser(description="Fix module paths in existing skills.")
+        parser.add_argument("--verbose", action="store_true", help="List every skill's module path before fixing")
+        args = parser.parse_args()
+        fix_module_paths(verbose=args.verbose)
     except KeyboardInterrupt:
         print("\n\n⏸️  Operation cancelled by user")
         sys.exit(1)
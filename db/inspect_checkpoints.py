@@ -27,28 +27,29 @@ def inspect_checkpoints():
     try:
         with psycopg.connect(db_uri, autocommit=True) as conn:
             with conn.cursor() as cur:
-                # 1. List all checkpoint-related tables
-                print("=== CHECKPOINT TABLES ===")
+                # 1+2. Checkpoint tables and checkpoint_writes columns in one round-trip
                 cur.execute("""
-                    SELECT table_name 
+                    SELECT 'table' AS kind, table_name AS name, NULL AS data_type, 0 AS pos
                     FROM information_schema.tables 
                     WHERE table_schema = 'public' 
                       AND table_name LIKE 'checkpoint%'
-                    ORDER BY table_name
+                    UNION ALL
+                    SELECT 'column', column_name, data_type, ordinal_position
+                    FROM information_schema.columns 
+                    WHERE table_name = 'checkpoint_writes'
+                    ORDER BY kind DESC, pos, name
                 """)
-                tables = cur.fetchall()
-                for table in tables:
-                    print(f"  - {table[0]}")
+                schema_rows = cur.fetchall()
+                
+                # 1. List all checkpoint-related tables
+                print("=== CHECKPOINT TABLES ===")
+                for kind, name, _, _ in schema_rows:
+                    if kind == 'table':
+                        print(f"  - {name}")
                 
                 # 2. Show checkpoint_writes structure if it exists
                 print("\n=== CHECKPOINT_WRITES COLUMNS ===")
-                cur.execute("""
-                    SELECT column_name, data_type 
-                    FROM information_schema.columns 
-                    WHERE table_name = 'checkpoint_writes'
-                    ORDER BY ordinal_position
-                """)
-                columns = cur.fetchall()
+                columns = [(name, dtype) for kind, name, dtype, _ in schema_rows if kind == 'column']
                 if columns:
                     for col, dtype in columns:
                         print(f"  {col}: {dtype}")
@@ -69,21 +70,23 @@ def inspect_checkpoints():
                             else:
                                 print(f"  {col_name}: {str(val)[:100]}")
                 
-                # 4. Get a sample checkpoint with channel_versions
+                # 4. Get a sample checkpoint with channel_versions (the same latest
+                # checkpoint also supplies the data_store reference for step 5)
                 print("\n=== SAMPLE CHECKPOINT STRUCTURE ===")
                 cur.execute("""
                     SELECT 
                         thread_id,
                         checkpoint_id,
-                        checkpoint->'channel_versions' as channel_versions
+                        checkpoint->'channel_versions' as channel_versions,
+                        checkpoint->'channel_versions'->>'data_store' as data_store_ref
                     FROM checkpoints
                     WHERE checkpoint_ns = ''
                     ORDER BY (checkpoint->>'ts')::timestamp DESC
                     LIMIT 1
                 """)
-                row = cur.fetchone()
-                if row:
-                    thread_id, checkpoint_id, versions = row
+                latest = cur.fetchone()
+                if latest:
+                    thread_id, checkpoint_id, versions, _ = latest
                     print(f"  Thread: {thread_id}")
                     print(f"  Checkpoint ID: {checkpoint_id}")
                     print(f"  Channel Versions: {json.dumps(versions, indent=2, default=str)[:500]}")
@@ -91,18 +94,8 @@ def inspect_checkpoints():
                 # 5. Try to find the actual data_store
                 print("\n=== FINDING ACTUAL DATA_STORE ===")
                 
-                # Get the data_store reference from latest checkpoint
-                cur.execute("""
-                    SELECT 
-                        thread_id,
-                        checkpoint_id,
-                        checkpoint->'channel_versions'->>'data_store' as data_store_ref
-                    FROM checkpoints
-                    WHERE checkpoint_ns = ''
-                    ORDER BY (checkpoint->>'ts')::timestamp DESC
-                    LIMIT 1
-                """)
-                row = cur.fetchone()
+                # data_store reference from the latest checkpoint fetched above
+                row = (latest[0], latest[1], latest[3]) if latest else None
                 
                 if row:
                     thread_id, cp_id, data_store_ref = row
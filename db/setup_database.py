@@ -24,7 +24,7 @@ def apply_schema(conn, schema_file: Path, description: str, is_checkpoint_schema
     print(f"Applying: {description}")
     print(f"{'='*60}")
     
-    schema_sql = schema_file.read_text()
+    schema_sql = schema_file.read_bytes().decode("utf-8")
     
     try:
         with conn.cursor() as cur:
@@ -104,6 +104,8 @@ def main():
         (db_dir / "dynamic_skills_schema.sql", "Dynamic skills schema (UI skill builder)", False),
         (db_dir / "add_llm_model_to_dynamic_skills.sql", "Dynamic skills LLM model column (migration)", False),
         (db_dir / "add_action_functions_column.sql", "Action functions column (migration)", False),
+        (db_dir / "add_skill_version_migration.sql", "Dynamic skills version column (migration)", False),
+        (db_dir / "add_skill_code_hash_migration.sql", "Dynamic skills code hash columns (migration)", False),
         (db_dir / "users_schema.sql", "User management schema (authentication)", False),
         (db_dir / "workspaces_schema.sql", "Workspace schema (per-user isolation)", False),
         (db_dir / "add_user_tracking_migration.sql", "User tracking migration (user_id columns)", False),
@@ -114,6 +116,8 @@ def main():
         (db_dir / "fix_skill_name_uniqueness.sql", "CRITICAL: Fix skill name uniqueness per workspace", False),
         (db_dir / "remove_module_name_trigger.sql", "Remove module_name trigger (Python handles naming)", False),
         (db_dir / "run_list_view.sql", "Run list view with computed status", False),
+        (db_dir / "add_run_manager_indexes_migration.sql", "Run manager list indexes (migration)", False),
+        (db_dir / "add_skill_visibility_indexes_migration.sql", "Skill visibility indexes (migration)", False),
     ]
     
     print(f"\nConnecting to database...")
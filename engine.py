@@ -149,6 +149,8 @@ class Skill(BaseModel):
     owner_id: Optional[str] = None  # Skill owner
     is_public: bool = False  # Visibility outside workspace
     module_name: Optional[str] = None  # Unique identifier for registry (DB: {code}.{name}; fs: fs.{name})
+    source: str = "filesystem"  # "filesystem" or "database" (set at load time)
+    db_metadata: Optional[Dict[str, Any]] = None  # dynamic_skills row info (id, enabled, timestamps, version, ...)
 
 class PlannerDecision(BaseModel):
     next_agent: str = Field(description="Name of agent or 'END'")
@@ -1395,12 +1397,12 @@ async def _execute_postgres_query(cfg: ActionConfig, inputs: Dict[str, Any]) ->
 
 async def _execute_mongodb_query(cfg: ActionConfig, inputs: Dict[str, Any]) -> Dict[str, Any]:
     """Execute a MongoDB query"""
-    from data.mongo import get_collection
+    from data.mongo import get_async_collection
     
     if not cfg.collection:
         raise ValueError("mongodb query requires 'collection' field")
     
-    collection = get_collection(cfg.collection)
+    collection = get_async_collection(cfg.collection)
     
     # Format filter with input context
     filter_dict = cfg.filter or {}
@@ -1411,17 +1413,13 @@ async def _execute_mongodb_query(cfg: ActionConfig, inputs: Dict[str, Any]) -> D
         else:
             formatted_filter[key] = value
     
-    # Execute query in thread
-    def _execute_sync():
-        results = list(collection.find(formatted_filter))
+    try:
+        # Native async driver: awaiting the cursor yields to the event loop, no worker thread
+        results = await collection.find(formatted_filter).to_list()
         # Convert ObjectId to string for serialization
         for doc in results:
             if '_id' in doc:
                 doc['_id'] = str(doc['_id'])
-        return results
-    
-    try:
-        results = await asyncio.to_thread(_execute_sync)
         await publish_log(f"[ACTIONS] MongoDB query executed successfully ({len(results)} docs)")
         return {
             "query_result": results,
@@ -1800,8 +1798,7 @@ async def _execute_pipeline_step(
             skill_name = step.get("skill")
             if not skill_name:
                 raise ValueError(f"{error_prefix}: 'skill' type requires 'skill' field")
-            registry = get_skill_registry_for_workspace(workspace_id)
-            skill = next((s for s in registry if s.name == skill_name), None)
+            skill = get_skill_for_workspace(skill_name, workspace_id)
             if not skill:
                 raise ValueError(f"Skill '{skill_name}' not found in registry")
             skill_inputs = {key: context.get(key) for key in input_keys if key in context}
@@ -2164,18 +2161,54 @@ except Exception as e:
     print(f"[ENGINE] Loaded {len(SKILL_REGISTRY)} skills from filesystem only")
 
 
+def _index_skills_by_name(skills: List[Skill]) -> Dict[str, List[Skill]]:
+    """Group registry skills by name (names are only unique per workspace)."""
+    index: Dict[str, List[Skill]] = {}
+    for s in skills:
+        index.setdefault(s.name, []).append(s)
+    return index
+
+
+# Name -> skills lookup kept in sync with SKILL_REGISTRY (rebuilt by reload_skill_registry)
+SKILL_REGISTRY_BY_NAME = _index_skills_by_name(SKILL_REGISTRY)
+
+
+def get_skill_for_workspace(name: str, workspace_id: Optional[str]) -> Optional[Skill]:
+    """
+    Look up a registry skill by name, applying the same visibility rules as
+    get_skill_registry_for_workspace without scanning the whole registry.
+    """
+    for s in SKILL_REGISTRY_BY_NAME.get(name, ()):
+        if workspace_id is None or s.workspace_id is None or s.workspace_id == workspace_id or s.is_public:
+            return s
+    return None
+
+
+# Per-workspace views of SKILL_REGISTRY, valid while the registry list is the same object
+# (reloads and single-skill patches always rebind SKILL_REGISTRY, never mutate it).
+_WORKSPACE_REGISTRY_VIEWS: Dict[str, List[Skill]] = {}
+_WORKSPACE_REGISTRY_VIEWS_SOURCE: Optional[List[Skill]] = None
+
+
 def get_skill_registry_for_workspace(workspace_id: Optional[str]) -> List[Skill]:
     """
     Filter skills for a workspace, allowing public and workspace-specific skills.
     Filesystem skills are treated as public (workspace_id=None, is_public=True).
+    
+    The filtered list is computed once per workspace and registry; treat it as read-only.
     """
+    global _WORKSPACE_REGISTRY_VIEWS, _WORKSPACE_REGISTRY_VIEWS_SOURCE
+    registry = SKILL_REGISTRY
     if workspace_id is None:
-        return SKILL_REGISTRY
-    return [
-        s
-        for s in SKILL_REGISTRY
-        if s.workspace_id is None or s.workspace_id == workspace_id or s.is_public
-    ]
+        return registry
+    if _WORKSPACE_REGISTRY_VIEWS_SOURCE is not registry:
+        _WORKSPACE_REGISTRY_VIEWS = {}
+        _WORKSPACE_REGISTRY_VIEWS_SOURCE = registry
+    view = _WORKSPACE_REGISTRY_VIEWS.get(workspace_id)
+    if view is None:
+        view = [s for s in registry if s.workspace_id is None or s.workspace_id == workspace_id or s.is_public]
+        _WORKSPACE_REGISTRY_VIEWS[workspace_id] = view
+    return view
 
 
 WORKFLOW_UI_EMITTER = WorkflowUiEmitter()
@@ -2563,8 +2596,9 @@ async def skilled_executor(state: AgentState):
     
     skill_name = state["active_skill"]
     workspace_id = state.get("workspace_id")
-    registry = get_skill_registry_for_workspace(workspace_id)
-    skill_meta = next(s for s in registry if s.name == skill_name)
+    skill_meta = get_skill_for_workspace(skill_name, workspace_id)
+    if skill_meta is None:
+        raise ValueError(f"Skill '{skill_name}' not found in registry")
 
     # await publish_log(f"[EXECUTOR] Running {skill_name}...")
     
@@ -2685,9 +2719,7 @@ def route_post_exec(state: AgentState):
     
     # Find the skill metadata safely
     workspace_id = state.get("workspace_id")
-    registry = get_skill_registry_for_workspace(workspace_id)
-    
-    skill_meta = next((s for s in registry if s.name == skill_name), None)
+    skill_meta = get_skill_for_workspace(skill_name, workspace_id)
     if not skill_meta:
         emit_log(f"[ROUTER] Unknown skill '{skill_name}', routing to planner.")
         return "planner"
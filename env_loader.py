@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import logging
 import os
 from pathlib import Path
 from typing import Iterable, List, Tuple
 
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
 # Track which project roots have already been processed to avoid re-loading.
 _LOADED_ROOTS: set[str] = set()
 
@@ -36,7 +39,7 @@ def load_env_once(
     Args:
         project_root: Base path to look for env files. Defaults to this file's parent.
         extra_paths: Optional iterable of (path, override) to include after defaults.
-        log: When True, prints a short summary of what was loaded.
+        log: When True, logs (INFO) a short summary of what was loaded.
 
     Returns:
         List of env file paths that were successfully loaded (empty if already loaded).
@@ -58,9 +61,9 @@ def load_env_once(
 
     _LOADED_ROOTS.add(root_key)
 
-    if log:
+    if log and logger.isEnabledFor(logging.INFO):
         summary = ", ".join(str(p) for p in loaded) if loaded else "none found"
-        print(f"[env_loader] env files loaded: {summary}")
+        logger.info("[env_loader] env files loaded: %s", summary)
 
     return loaded
 
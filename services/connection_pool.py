@@ -67,6 +67,8 @@ _DEFAULT_MONGO_CONFIG = {
     "serverSelectionTimeoutMS": 30000,  # 30 seconds
     "connectTimeoutMS": 20000,  # 20 seconds
     "socketTimeoutMS": 60000,  # 60 seconds for long queries
+    "retryWrites": True,
+    "appname": "agentskills-api",  # Shows up in server logs and currentOp
 }
 
 
@@ -94,7 +96,7 @@ def _get_postgres_config() -> Dict[str, Any]:
     return config
 
 
-def _get_mongo_config() -> Dict[str, Any]:
+def get_mongo_config() -> Dict[str, Any]:
     """Get MongoDB connection configuration from environment or defaults."""
     config = _DEFAULT_MONGO_CONFIG.copy()
     
@@ -103,6 +105,13 @@ def _get_mongo_config() -> Dict[str, Any]:
         config["maxPoolSize"] = int(max_pool)
     if min_pool := os.getenv("MONGO_MIN_POOL_SIZE"):
         config["minPoolSize"] = int(min_pool)
+    if max_idle := os.getenv("MONGO_MAX_IDLE_TIME_MS"):
+        config["maxIdleTimeMS"] = int(max_idle)
+    if wait_queue := os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS"):
+        config["waitQueueTimeoutMS"] = int(wait_queue)
+    # Wire compression, e.g. "zstd,snappy,zlib" (zstd/snappy need their optional packages)
+    if compressors := os.getenv("MONGO_COMPRESSORS"):
+        config["compressors"] = compressors
     
     return config
 
@@ -155,6 +164,9 @@ def initialize_pools(force: bool = False):
                     max_idle=config["max_idle"],
                     reconnect_timeout=config["reconnect_timeout"],
                     kwargs=connection_kwargs,
+                    # Verify each connection on checkout so ones dropped while idle
+                    # (server restart, proxy timeout) are replaced instead of failing a request
+                    check=ConnectionPool.check_connection,
                     open=True,  # Open connections immediately
                 )
                 logger.info(
@@ -171,7 +183,7 @@ def initialize_pools(force: bool = False):
         mongo_uri = _get_env_value("MONGODB_URI", "")
         if mongo_uri:
             try:
-                config = _get_mongo_config()
+                config = get_mongo_config()
                 _mongo_client = MongoClient(mongo_uri, **config)
                 
                 # Test connection
@@ -222,6 +234,27 @@ def close_pools():
         _initialized = False
 
 
+def _reset_after_fork() -> None:
+    """
+    Drop pools inherited from the parent so a forked worker opens its own sockets.
+    
+    The inherited objects are abandoned rather than closed: closing them would shut
+    connections the parent is still using. The lock is replaced in case another
+    thread held it at fork time.
+    """
+    global _postgres_pool, _mongo_client, _pool_lock, _initialized
+    _postgres_pool = None
+    _mongo_client = None
+    _pool_lock = threading.Lock()
+    _initialized = False
+
+
+# Pre-fork servers (gunicorn with preload_app) must not share pooled connections
+# across workers. Not available on Windows, which does not fork.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
 def get_postgres_pool() -> ConnectionPool:
     """
     Get the shared Postgres connection pool.
@@ -36,11 +36,6 @@ class DatabaseCredential(BaseModel):
     # Additional connection parameters (optional)
     ssl_mode: Optional[str] = None
     connection_timeout: Optional[int] = 30
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class CredentialReference(BaseModel):
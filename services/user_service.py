@@ -15,7 +15,7 @@ import hashlib
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import asyncio
-from pydantic import BaseModel, EmailStr, Field, validator
+from pydantic import BaseModel, EmailStr, Field, field_validator
 import jwt
 import bcrypt
 from services.connection_pool import get_postgres_pool
@@ -27,13 +27,15 @@ class UserRegistration(BaseModel):
     email: EmailStr
     password: str = Field(..., min_length=8, max_length=255)
     
-    @validator('username')
+    @field_validator('username')
+    @classmethod
     def username_alphanumeric(cls, v):
         if not v.replace('_', '').replace('-', '').isalnum():
             raise ValueError('Username must be alphanumeric (with optional _ or -)')
         return v
     
-    @validator('password')
+    @field_validator('password')
+    @classmethod
     def password_strong(cls, v):
         if len(v) < 8:
             raise ValueError('Password must be at least 8 characters')
@@ -62,7 +64,8 @@ class PasswordReset(BaseModel):
     token: str
     new_password: str = Field(..., min_length=8, max_length=255)
     
-    @validator('new_password')
+    @field_validator('new_password')
+    @classmethod
     def password_strong(cls, v):
         if len(v) < 8:
             raise ValueError('Password must be at least 8 characters')
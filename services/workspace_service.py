@@ -10,10 +10,11 @@ Provides:
 from __future__ import annotations
 
 import asyncio
-from typing import List, Optional
+import time
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from fastapi import HTTPException, status
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator
 import os
 from services.connection_pool import get_postgres_pool
 
@@ -31,7 +32,8 @@ class Workspace(BaseModel):
 class WorkspaceCreate(BaseModel):
     name: str = Field(..., min_length=1, max_length=128)
 
-    @validator("name")
+    @field_validator("name")
+    @classmethod
     def trim_name(cls, v: str) -> str:
         cleaned = v.strip()
         if not cleaned:
@@ -39,6 +41,20 @@ class WorkspaceCreate(BaseModel):
         return cleaned
 
 
+# resolve_workspace results keyed by (user_id, workspace_id or ""). Every admin request
+# resolves its workspace, so repeat calls skip the lookup. Entries for a user are dropped
+# when that user's workspaces change in this process; the TTL bounds staleness otherwise.
+_RESOLVE_CACHE_TTL_SECONDS = 30
+_RESOLVE_CACHE_MAX_ENTRIES = 1024
+_resolve_cache: Dict[Tuple[str, str], Tuple[float, Workspace]] = {}
+
+
+def _invalidate_resolved_workspaces(user_id: str) -> None:
+    """Forget cached workspace resolutions for a user."""
+    for key in [key for key in _resolve_cache if key[0] == user_id]:
+        _resolve_cache.pop(key, None)
+
+
 class WorkspaceService:
     """Service for managing user workspaces using centralized connection pool"""
     
@@ -191,7 +207,9 @@ class WorkspaceService:
             finally:
                 pool.putconn(conn)
 
-        return await asyncio.to_thread(_create)
+        workspace = await asyncio.to_thread(_create)
+        _invalidate_resolved_workspaces(user_id)
+        return workspace
 
     async def set_default(self, user_id: str, workspace_id: str) -> Workspace:
         """Mark a workspace as default for the user."""
@@ -240,7 +258,9 @@ class WorkspaceService:
             finally:
                 pool.putconn(conn)
 
-        return await asyncio.to_thread(_set_default)
+        workspace = await asyncio.to_thread(_set_default)
+        _invalidate_resolved_workspaces(user_id)
+        return workspace
 
     async def resolve_workspace(self, user_id: str, workspace_id: Optional[str]) -> Workspace:
         """
@@ -248,9 +268,23 @@ class WorkspaceService:
         - If workspace_id is provided, validate ownership
         - Otherwise return default workspace
         """
+        key = (user_id, workspace_id or "")
+        cached = _resolve_cache.get(key)
+        if cached and (time.time() - cached[0]) < _RESOLVE_CACHE_TTL_SECONDS:
+            return cached[1]
+        
         if not workspace_id:
-            return await self.ensure_default(user_id)
+            workspace = await self.ensure_default(user_id)
+        else:
+            workspace = await self._resolve_by_id(user_id, workspace_id)
         
+        if len(_resolve_cache) >= _RESOLVE_CACHE_MAX_ENTRIES:
+            _resolve_cache.clear()
+        _resolve_cache[key] = (time.time(), workspace)
+        return workspace
+
+    async def _resolve_by_id(self, user_id: str, workspace_id: str) -> Workspace:
+        """Load a workspace by ID and verify the user owns it."""
         pool = get_postgres_pool()
 
         def _resolve():
@@ -5,23 +5,186 @@ Handles loading, saving, and reloading skills from both filesystem and database.
 Supports hot-reload without application restart.
 """
 
+import asyncio
 import os
 import json
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from pathlib import Path
 import psycopg
 from pydantic import ValidationError
 
 from env_loader import load_env_once
+from services.connection_pool import get_postgres_pool
 
+# Env files are loaded once at import, not on every get_db_connection() call
+load_env_once(Path(__file__).resolve().parent)
 
-def get_db_connection():
-    """Get database connection using environment settings."""
-    load_env_once(Path(__file__).resolve().parent)
-    db_uri = os.getenv("DATABASE_URL")
-    if not db_uri:
+# Bumped on every registry reload; cached skill listings from an older version are stale.
+_registry_version = 0
+# Serializes registry rebinds (full reloads and single-skill patches run in worker threads),
+# so one rebuild never overwrites another's patch or collapses two version bumps into one.
+_registry_lock = threading.Lock()
+
+# get_all_skills_metadata cache: (registry_version, fetched_at, skills). The TTL is a
+# safety net for edits made by other worker processes, which do not bump our version.
+_METADATA_CACHE_TTL_SECONDS = 5
+_skills_metadata_cache: Optional[Tuple[int, float, List[Dict[str, Any]]]] = None
+# Same entries for get_all_skills_metadata_batch, keyed by (workspace_id, include_public)
+_WORKSPACE_METADATA_CACHE_MAX_ENTRIES = 256
+_workspace_metadata_cache: Dict[Tuple[str, bool], Tuple[int, float, List[Dict[str, Any]]]] = {}
+# skills/*/skill.md frontmatter scan shared by all listings (same version + TTL rule)
+_filesystem_metadata_cache: Optional[Tuple[int, float, List[Dict[str, Any]]]] = None
+
+
+def get_registry_version() -> int:
+    """Current registry version (changes whenever the skill registry is reloaded or patched)."""
+    return _registry_version
+
+
+def get_registry_skill_count() -> int:
+    """Number of skills currently in the live registry."""
+    import engine
+    return len(engine.SKILL_REGISTRY)
+
+
+@contextmanager
+def get_db_connection() -> Iterator[psycopg.Connection]:
+    """
+    Borrow a connection from the shared Postgres pool for one unit of work.
+    
+    Pooled connections are autocommit; this switches the borrowed one to a
+    transaction (committed on success, rolled back on error) like a plain
+    `with psycopg.connect(...)` block, then restores it before returning it
+    to the pool.
+    """
+    if not os.getenv("DATABASE_URL"):
         raise RuntimeError("DATABASE_URL not configured")
-    return psycopg.connect(db_uri)
+    pool = get_postgres_pool()
+    with pool.connection() as conn:
+        conn.autocommit = False
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.autocommit = True
+
+
+_SKILL_LOAD_COLUMNS = """
+    name, module_name, description, requires, produces, optional_produces,
+    executor, hitl_enabled, prompt, system_prompt, llm_model,
+    rest_config, action_config, action_code, action_functions,
+    workspace_id::text, owner_id::text, is_public,
+    id::text, enabled, created_at, updated_at, version
+"""
+
+
+def _skill_dict_from_row(row, register: bool = True) -> Dict[str, Any]:
+    """
+    Build a Skill-compatible dict from a _SKILL_LOAD_COLUMNS row, registering any
+    inline action code or pipeline functions it carries.
+    
+    With register=False nothing is registered, so the row can be validated before
+    its transaction commits.
+    
+    Raises if the row cannot be turned into a skill.
+    """
+    (name, module_name, description, requires, produces, optional_produces,
+     executor, hitl_enabled, prompt, system_prompt, llm_model,
+     rest_config, action_config, action_code, action_functions,
+     workspace_id, owner_id, is_public,
+     skill_id, enabled, created_at, updated_at, version) = row
+    
+    skill_dict = {
+        "name": name,
+        "module_name": module_name,
+        "description": description,
+        "requires": set(requires or []),
+        "produces": set(produces or []),
+        "optional_produces": set(optional_produces or []),
+        "executor": executor,
+        "hitl_enabled": hitl_enabled,
+        "prompt": prompt,
+        "system_prompt": system_prompt,
+        "llm_model": llm_model,
+        "workspace_id": workspace_id,
+        "owner_id": owner_id,
+        "is_public": bool(is_public),
+        "source": "database",
+        # Row metadata cached so API reads don't need another query
+        "db_metadata": {
+            "id": skill_id,
+            "enabled": enabled,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "action_code": action_code,
+            "action_functions": action_functions,
+            "module_name": module_name,
+            "workspace_id": workspace_id,
+            "owner_id": owner_id,
+            "is_public": bool(is_public),
+            "version": version,
+        },
+    }
+
+    # Add executor-specific config
+    if executor == "rest" and rest_config:
+        from engine import RestConfig
+        skill_dict["rest"] = RestConfig(**rest_config)
+    elif executor == "action" and action_config:
+        from engine import ActionConfig
+        import yaml
+
+        # For data_pipeline, parse steps from action_code YAML
+        if action_config.get("type") == "data_pipeline" and action_code:
+            try:
+                # Parse YAML from action_code
+                pipeline_data = yaml.safe_load(action_code)
+                if pipeline_data and "steps" in pipeline_data:
+                    action_config["steps"] = pipeline_data["steps"]
+                else:
+                    print(f"[SKILL_DB] Warning: No 'steps' found in pipeline YAML for {name}")
+            except Exception as e:
+                print(f"[SKILL_DB] Warning: Failed to parse pipeline YAML for {name}: {e}")
+                # Continue without pipeline steps - skill will fail at runtime but won't crash loading
+
+            # Register pipeline functions if provided (but don't fail skill loading)
+            if action_functions and register:
+                try:
+                    _register_pipeline_functions(module_name, action_functions)
+                except (SyntaxError, RuntimeError) as e:
+                    print(f"[SKILL_DB] WARNING: Failed to register pipeline functions for '{name}': {e}")
+                    print(f"[SKILL_DB] Skill '{name}' will still load but pipeline may fail at runtime")
+                    # Don't skip the skill - allow it to load so it can be edited
+
+        # If python_function with inline code, register and update module path
+        if action_config.get("type") == "python_function" and action_code:
+            try:
+                # Check if function name is specified
+                function_name = action_config.get("function")
+                if not function_name:
+                    raise ValueError("action_config must include 'function' field specifying the function name to call")
+
+                # Register the function with the module_name
+                if register:
+                    _register_inline_action(module_name, function_name, action_code)
+
+                # Update action_config to use correct module path BEFORE creating ActionConfig
+                action_config["module"] = f"dynamic_skills.{module_name}"
+            except Exception as e:
+                print(f"[SKILL_DB] WARNING: Failed to register action code for '{name}': {e}")
+                print(f"[SKILL_DB] Skill '{name}' will still load but may fail at runtime")
+                # Don't skip the skill - allow it to load so it can be edited
+
+        # Create ActionConfig AFTER updating the module field
+        skill_dict["action"] = ActionConfig(**action_config)
+    
+    return skill_dict
 
 
 def load_skills_from_database(workspace_id: Optional[str] = None, include_public: bool = True) -> List[Dict[str, Any]]:
@@ -36,26 +199,8 @@ def load_skills_from_database(workspace_id: Optional[str] = None, include_public
     try:
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                base_sql = """
-                    SELECT 
-                        name,
-                        module_name,
-                        description,
-                        requires,
-                        produces,
-                        optional_produces,
-                        executor,
-                        hitl_enabled,
-                        prompt,
-                        system_prompt,
-                        llm_model,
-                        rest_config,
-                        action_config,
-                        action_code,
-                        action_functions,
-                        workspace_id::text,
-                        owner_id::text,
-                        is_public
+                base_sql = f"""
+                    SELECT {_SKILL_LOAD_COLUMNS}
                     FROM dynamic_skills
                     WHERE enabled = true
                 """
@@ -75,82 +220,9 @@ def load_skills_from_database(workspace_id: Optional[str] = None, include_public
                 
                 skills = []
                 for row in cur.fetchall():
-                    (name, module_name, description, requires, produces, optional_produces,
-                     executor, hitl_enabled, prompt, system_prompt, llm_model,
-                     rest_config, action_config, action_code, action_functions,
-                     workspace_id, owner_id, is_public) = row
-                    
+                    name = row[0]
                     try:
-                        skill_dict = {
-                            "name": name,
-                            "module_name": module_name,
-                            "description": description,
-                            "requires": set(requires or []),
-                            "produces": set(produces or []),
-                            "optional_produces": set(optional_produces or []),
-                            "executor": executor,
-                            "hitl_enabled": hitl_enabled,
-                            "prompt": prompt,
-                            "system_prompt": system_prompt,
-                            "llm_model": llm_model,
-                            "workspace_id": workspace_id,
-                            "owner_id": owner_id,
-                            "is_public": bool(is_public),
-                        }
-                        
-                        # Add executor-specific config
-                        if executor == "rest" and rest_config:
-                            from engine import RestConfig
-                            skill_dict["rest"] = RestConfig(**rest_config)
-                        elif executor == "action" and action_config:
-                            from engine import ActionConfig
-                            import yaml
-                            
-                            # For data_pipeline, parse steps from action_code YAML
-                            if action_config.get("type") == "data_pipeline" and action_code:
-                                try:
-                                    # Parse YAML from action_code
-                                    pipeline_data = yaml.safe_load(action_code)
-                                    if pipeline_data and "steps" in pipeline_data:
-                                        action_config["steps"] = pipeline_data["steps"]
-                                    else:
-                                        print(f"[SKILL_DB] Warning: No 'steps' found in pipeline YAML for {name}")
-                                except Exception as e:
-                                    print(f"[SKILL_DB] Warning: Failed to parse pipeline YAML for {name}: {e}")
-                                    # Continue without pipeline steps - skill will fail at runtime but won't crash loading
-                                
-                                # Register pipeline functions if provided (but don't fail skill loading)
-                                if action_functions:
-                                    try:
-                                        _register_pipeline_functions(module_name, action_functions)
-                                    except (SyntaxError, RuntimeError) as e:
-                                        print(f"[SKILL_DB] WARNING: Failed to register pipeline functions for '{name}': {e}")
-                                        print(f"[SKILL_DB] Skill '{name}' will still load but pipeline may fail at runtime")
-                                        # Don't skip the skill - allow it to load so it can be edited
-                            
-                            # If python_function with inline code, register and update module path
-                            if action_config.get("type") == "python_function" and action_code:
-                                try:
-                                    # Check if function name is specified
-                                    function_name = action_config.get("function")
-                                    if not function_name:
-                                        raise ValueError("action_config must include 'function' field specifying the function name to call")
-                                    
-                                    # Register the function with the module_name
-                                    _register_inline_action(module_name, function_name, action_code)
-                                    
-                                    # Update action_config to use correct module path BEFORE creating ActionConfig
-                                    action_config["module"] = f"dynamic_skills.{module_name}"
-                                except Exception as e:
-                                    print(f"[SKILL_DB] WARNING: Failed to register action code for '{name}': {e}")
-                                    print(f"[SKILL_DB] Skill '{name}' will still load but may fail at runtime")
-                                    # Don't skip the skill - allow it to load so it can be edited
-                            
-                            # Create ActionConfig AFTER updating the module field
-                            skill_dict["action"] = ActionConfig(**action_config)
-                        
-                        skills.append(skill_dict)
-                        
+                        skills.append(_skill_dict_from_row(row))
                     except Exception as e:
                         # Log the error but continue loading other skills
                         print(f"[SKILL_DB] ERROR: Failed to load skill '{name}': {e}")
@@ -296,7 +368,7 @@ def _register_pipeline_functions(module_name: str, functions_code: str):
         raise RuntimeError(f"Failed to register pipeline functions for {module_name}: {e}")
 
 
-def save_skill_to_database(skill_data: Dict[str, Any]) -> str:
+def save_skill_to_database(skill_data: Dict[str, Any], conn=None) -> str:
     """
     Save or update a skill in the database.
     
@@ -309,140 +381,238 @@ def save_skill_to_database(skill_data: Dict[str, Any]) -> str:
     
     Args:
         skill_data: Skill configuration dictionary
+        conn: Open connection to write on; the caller commits. By default a new
+            connection is opened and committed here.
         
     Returns:
         Skill ID (UUID as string)
     """
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            workspace_id = skill_data.get("workspace_id")
-            if not workspace_id:
-                raise ValueError("workspace_id is required to save a database skill (module namespace needs workspace code)")
-
-            # Fetch workspace code
-            cur.execute("SELECT code FROM workspaces WHERE id = %s", (workspace_id,))
-            ws_row = cur.fetchone()
-            if not ws_row or not ws_row[0]:
-                raise ValueError(f"Workspace not found or missing code: {workspace_id}")
-            workspace_code = ws_row[0]
-            
-            skill_id = skill_data.get("id")
-            
-            # Compute module_name only for INSERT (new skills)
-            # For UPDATE, we fetch the existing module_name from database (name is immutable)
-            if skill_id:
-                # UPDATE mode: fetch existing module_name (name cannot change)
-                cur.execute("SELECT module_name FROM dynamic_skills WHERE id = %s", (skill_id,))
-                existing_row = cur.fetchone()
-                if not existing_row:
-                    raise ValueError(f"Skill with id {skill_id} not found")
-                module_name = existing_row[0]
-                print(f"[SKILL_DB] UPDATE mode: reusing existing module_name={module_name}")
-            else:
-                # INSERT mode: compute new namespaced module_name
-                cur.execute("SELECT generate_module_name(%s)", (skill_data["name"],))
-                base_module_name = cur.fetchone()[0]
-                module_name = f"{workspace_code}.{base_module_name}"
-                print(f"[SKILL_DB] INSERT mode: workspace_code={workspace_code}, base={base_module_name}, module_name={module_name}")
-            
-            # If this is a python_function action, ensure module field is set correctly
-            action_config = skill_data.get("action_config")
-            if action_config and isinstance(action_config, dict):
-                if action_config.get("type") == "python_function":
-                    # Always set the module path using the sanitized module_name
-                    action_config["module"] = f"dynamic_skills.{module_name}"
+    if conn is None:
+        with get_db_connection() as own_conn:
+            skill_id = save_skill_to_database(skill_data, conn=own_conn)
+            own_conn.commit()
+            return skill_id
+    
+    with conn.cursor() as cur:
+        workspace_id = skill_data.get("workspace_id")
+        if not workspace_id:
+            raise ValueError("workspace_id is required to save a database skill (module namespace needs workspace code)")
+
+        # Fetch workspace code
+        cur.execute("SELECT code FROM workspaces WHERE id = %s", (workspace_id,))
+        ws_row = cur.fetchone()
+        if not ws_row or not ws_row[0]:
+            raise ValueError(f"Workspace not found or missing code: {workspace_id}")
+        workspace_code = ws_row[0]
+        
+        skill_id = skill_data.get("id")
+        
+        # Compute module_name only for INSERT (new skills)
+        # For UPDATE, we fetch the existing module_name from database (name is immutable)
+        if skill_id:
+            # UPDATE mode: fetch existing module_name (name cannot change)
+            cur.execute("SELECT module_name FROM dynamic_skills WHERE id = %s", (skill_id,))
+            existing_row = cur.fetchone()
+            if not existing_row:
+                raise ValueError(f"Skill with id {skill_id} not found")
+            module_name = existing_row[0]
+            print(f"[SKILL_DB] UPDATE mode: reusing existing module_name={module_name}")
+        else:
+            # INSERT mode: compute new namespaced module_name
+            cur.execute("SELECT generate_module_name(%s)", (skill_data["name"],))
+            base_module_name = cur.fetchone()[0]
+            module_name = f"{workspace_code}.{base_module_name}"
+            print(f"[SKILL_DB] INSERT mode: workspace_code={workspace_code}, base={base_module_name}, module_name={module_name}")
+        
+        # If this is a python_function action, ensure module field is set correctly
+        action_config = skill_data.get("action_config")
+        if action_config and isinstance(action_config, dict):
+            if action_config.get("type") == "python_function":
+                # Always set the module path using the sanitized module_name
+                action_config["module"] = f"dynamic_skills.{module_name}"
+        
+        if skill_id:
+            # UPDATE mode: User provided an ID, update that specific skill
+            # NOTE: name is NOT updated (immutable), module_name stays the same
+            cur.execute("""
+                UPDATE dynamic_skills SET
+                    description = %(description)s,
+                    requires = %(requires)s,
+                    produces = %(produces)s,
+                    optional_produces = %(optional_produces)s,
+                    executor = %(executor)s,
+                    hitl_enabled = %(hitl_enabled)s,
+                    prompt = %(prompt)s,
+                    system_prompt = %(system_prompt)s,
+                    llm_model = %(llm_model)s,
+                    rest_config = %(rest_config)s,
+                    action_config = %(action_config)s,
+                    action_code = %(action_code)s,
+                    action_functions = %(action_functions)s,
+                    action_code_hash = %(action_code_hash)s,
+                    action_functions_hash = %(action_functions_hash)s,
+                    enabled = %(enabled)s,
+                    workspace_id = %(workspace_id)s,
+                    owner_id = %(owner_id)s,
+                    is_public = %(is_public)s
+                WHERE id = %(id)s
+                RETURNING id::text
+            """, {
+                "id": skill_id,
+                "description": skill_data.get("description", ""),
+                "requires": json.dumps(list(skill_data.get("requires", []))),
+                "produces": json.dumps(list(skill_data.get("produces", []))),
+                "optional_produces": json.dumps(list(skill_data.get("optional_produces", []))),
+                "executor": skill_data.get("executor", "llm"),
+                "hitl_enabled": skill_data.get("hitl_enabled", False),
+                "prompt": skill_data.get("prompt"),
+                "system_prompt": skill_data.get("system_prompt"),
+                "llm_model": skill_data.get("llm_model"),
+                "rest_config": json.dumps(skill_data.get("rest_config")) if skill_data.get("rest_config") else None,
+                "action_config": json.dumps(action_config) if action_config else None,
+                "action_code": skill_data.get("action_code"),
+                "action_functions": skill_data.get("action_functions"),
+                "action_code_hash": skill_data.get("action_code_hash"),
+                "action_functions_hash": skill_data.get("action_functions_hash"),
+                "enabled": skill_data.get("enabled", True),
+                "workspace_id": skill_data.get("workspace_id"),
+                "owner_id": skill_data.get("owner_id"),
+                "is_public": skill_data.get("is_public", False),
+            })
             
-            if skill_id:
-                # UPDATE mode: User provided an ID, update that specific skill
-                # NOTE: name is NOT updated (immutable), module_name stays the same
-                cur.execute("""
-                    UPDATE dynamic_skills SET
-                        description = %(description)s,
-                        requires = %(requires)s,
-                        produces = %(produces)s,
-                        optional_produces = %(optional_produces)s,
-                        executor = %(executor)s,
-                        hitl_enabled = %(hitl_enabled)s,
-                        prompt = %(prompt)s,
-                        system_prompt = %(system_prompt)s,
-                        llm_model = %(llm_model)s,
-                        rest_config = %(rest_config)s,
-                        action_config = %(action_config)s,
-                        action_code = %(action_code)s,
-                        action_functions = %(action_functions)s,
-                        enabled = %(enabled)s,
-                        workspace_id = %(workspace_id)s,
-                        owner_id = %(owner_id)s,
-                        is_public = %(is_public)s
-                    WHERE id = %(id)s
-                    RETURNING id::text
-                """, {
-                    "id": skill_id,
-                    "description": skill_data.get("description", ""),
-                    "requires": json.dumps(list(skill_data.get("requires", []))),
-                    "produces": json.dumps(list(skill_data.get("produces", []))),
-                    "optional_produces": json.dumps(list(skill_data.get("optional_produces", []))),
-                    "executor": skill_data.get("executor", "llm"),
-                    "hitl_enabled": skill_data.get("hitl_enabled", False),
-                    "prompt": skill_data.get("prompt"),
-                    "system_prompt": skill_data.get("system_prompt"),
-                    "llm_model": skill_data.get("llm_model"),
-                    "rest_config": json.dumps(skill_data.get("rest_config")) if skill_data.get("rest_config") else None,
-                    "action_config": json.dumps(action_config) if action_config else None,
-                    "action_code": skill_data.get("action_code"),
-                    "action_functions": skill_data.get("action_functions"),
-                    "enabled": skill_data.get("enabled", True),
-                    "workspace_id": skill_data.get("workspace_id"),
-                    "owner_id": skill_data.get("owner_id"),
-                    "is_public": skill_data.get("is_public", False),
-                })
-                
-                result = cur.fetchone()
-                if not result:
-                    raise ValueError(f"Skill with id {skill_id} not found")
-                skill_id = result[0]
-            else:
-                # INSERT mode: No ID provided, create new skill
-                # Will fail if (workspace_id, name) already exists due to unique constraint
-                cur.execute("""
-                    INSERT INTO dynamic_skills (
-                        name, module_name, description, requires, produces, optional_produces,
-                        executor, hitl_enabled, prompt, system_prompt,
-                        llm_model, rest_config, action_config, action_code, action_functions,
-                        source, enabled, workspace_id, owner_id, is_public
-                    ) VALUES (
-                        %(name)s, %(module_name)s, %(description)s, %(requires)s, %(produces)s, %(optional_produces)s,
-                        %(executor)s, %(hitl_enabled)s, %(prompt)s, %(system_prompt)s,
-                        %(llm_model)s, %(rest_config)s, %(action_config)s, %(action_code)s, %(action_functions)s,
-                        'database', %(enabled)s, %(workspace_id)s, %(owner_id)s, %(is_public)s
-                    )
-                    RETURNING id::text
-                """, {
-                    "name": skill_data["name"],
-                    "module_name": module_name,
-                    "description": skill_data.get("description", ""),
-                    "requires": json.dumps(list(skill_data.get("requires", []))),
-                    "produces": json.dumps(list(skill_data.get("produces", []))),
-                    "optional_produces": json.dumps(list(skill_data.get("optional_produces", []))),
-                    "executor": skill_data.get("executor", "llm"),
-                    "hitl_enabled": skill_data.get("hitl_enabled", False),
-                    "prompt": skill_data.get("prompt"),
-                    "system_prompt": skill_data.get("system_prompt"),
-                    "llm_model": skill_data.get("llm_model"),
-                    "rest_config": json.dumps(skill_data.get("rest_config")) if skill_data.get("rest_config") else None,
-                    "action_config": json.dumps(action_config) if action_config else None,
-                    "action_code": skill_data.get("action_code"),
-                    "action_functions": skill_data.get("action_functions"),
-                    "enabled": skill_data.get("enabled", True),
-                    "workspace_id": skill_data.get("workspace_id"),
-                    "owner_id": skill_data.get("owner_id"),
-                    "is_public": skill_data.get("is_public", False),
-                })
-                
-                skill_id = cur.fetchone()[0]
+            result = cur.fetchone()
+            if not result:
+                raise ValueError(f"Skill with id {skill_id} not found")
+            skill_id = result[0]
+        else:
+            # INSERT mode: No ID provided, create new skill
+            # Will fail if (workspace_id, name) already exists due to unique constraint
+            cur.execute("""
+                INSERT INTO dynamic_skills (
+                    name, module_name, description, requires, produces, optional_produces,
+                    executor, hitl_enabled, prompt, system_prompt,
+                    llm_model, rest_config, action_config, action_code, action_functions,
+                    action_code_hash, action_functions_hash,
+                    source, enabled, workspace_id, owner_id, is_public
+                ) VALUES (
+                    %(name)s, %(module_name)s, %(description)s, %(requires)s, %(produces)s, %(optional_produces)s,
+                    %(executor)s, %(hitl_enabled)s, %(prompt)s, %(system_prompt)s,
+                    %(llm_model)s, %(rest_config)s, %(action_config)s, %(action_code)s, %(action_functions)s,
+                    %(action_code_hash)s, %(action_functions_hash)s,
+                    'database', %(enabled)s, %(workspace_id)s, %(owner_id)s, %(is_public)s
+                )
+                RETURNING id::text
+            """, {
+                "name": skill_data["name"],
+                "module_name": module_name,
+                "description": skill_data.get("description", ""),
+                "requires": json.dumps(list(skill_data.get("requires", []))),
+                "produces": json.dumps(list(skill_data.get("produces", []))),
+                "optional_produces": json.dumps(list(skill_data.get("optional_produces", []))),
+                "executor": skill_data.get("executor", "llm"),
+                "hitl_enabled": skill_data.get("hitl_enabled", False),
+                "prompt": skill_data.get("prompt"),
+                "system_prompt": skill_data.get("system_prompt"),
+                "llm_model": skill_data.get("llm_model"),
+                "rest_config": json.dumps(skill_data.get("rest_config")) if skill_data.get("rest_config") else None,
+                "action_config": json.dumps(action_config) if action_config else None,
+                "action_code": skill_data.get("action_code"),
+                "action_functions": skill_data.get("action_functions"),
+                "action_code_hash": skill_data.get("action_code_hash"),
+                "action_functions_hash": skill_data.get("action_functions_hash"),
+                "enabled": skill_data.get("enabled", True),
+                "workspace_id": skill_data.get("workspace_id"),
+                "owner_id": skill_data.get("owner_id"),
+                "is_public": skill_data.get("is_public", False),
+            })
             
-            conn.commit()
-            return skill_id
+            skill_id = cur.fetchone()[0]
+        
+        return skill_id
+
+
+# Columns a partial update may write. Nullable columns can be cleared by sending None;
+# for the rest, None means "leave unchanged".
+_UPDATABLE_SKILL_COLUMNS = {
+    "description": False,
+    "requires": False,
+    "produces": False,
+    "optional_produces": False,
+    "executor": False,
+    "hitl_enabled": False,
+    "enabled": False,
+    "is_public": False,
+    "prompt": True,
+    "system_prompt": True,
+    "llm_model": True,
+    "rest_config": True,
+    "action_config": True,
+    "action_code": True,
+    "action_functions": True,
+    "action_code_hash": True,
+    "action_functions_hash": True,
+}
+_JSON_LIST_COLUMNS = {"requires", "produces", "optional_produces"}
+_JSON_OBJECT_COLUMNS = {"rest_config", "action_config"}
+
+
+def update_skill_fields(
+    skill_id: str,
+    module_name: str,
+    fields: Dict[str, Any],
+    expected_version: Optional[int] = None,
+) -> Optional[Tuple[str, int]]:
+    """
+    Apply a partial update to a database skill in a single UPDATE statement.
+    
+    Only the columns present in `fields` are written, so concurrent edits to other
+    columns are not overwritten with stale values (no read-modify-write of the row).
+    Every update bumps the row version.
+    
+    Args:
+        skill_id: Skill ID (UUID as string)
+        module_name: The skill's existing module_name (used for python_function paths)
+        fields: Column values to set (keys outside _UPDATABLE_SKILL_COLUMNS are ignored)
+        expected_version: If set, only update while the row is still at this version
+        
+    Returns:
+        (skill_id, new_version) if updated, None if no matching skill (or version) exists
+    """
+    assignments = []
+    params: Dict[str, Any] = {"id": skill_id}
+    for column, nullable in _UPDATABLE_SKILL_COLUMNS.items():
+        if column not in fields:
+            continue
+        value = fields[column]
+        if value is None and not nullable:
+            continue
+        if column in _JSON_LIST_COLUMNS:
+            value = json.dumps(list(value))
+        elif column in _JSON_OBJECT_COLUMNS:
+            if column == "action_config" and isinstance(value, dict) and value.get("type") == "python_function":
+                # Always set the module path using the sanitized module_name
+                value = {**value, "module": f"dynamic_skills.{module_name}"}
+            value = json.dumps(value) if value else None
+        assignments.append(f"{column} = %({column})s")
+        params[column] = value
+    
+    assignments.append("version = version + 1")
+    where = "id = %(id)s AND source = 'database'"
+    if expected_version is not None:
+        where += " AND version = %(expected_version)s"
+        params["expected_version"] = expected_version
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            # The SET list varies per request; don't let one-off shapes evict the hot
+            # statements from the connection's prepared-statement cache (pool prepares everything)
+            cur.execute(
+                f"UPDATE dynamic_skills SET {', '.join(assignments)} WHERE {where} RETURNING id::text, version",
+                params,
+                prepare=False,
+            )
+            result = cur.fetchone()
+        conn.commit()
+    return (result[0], result[1]) if result else None
 
 
 def delete_skill_from_database(skill_name: str) -> bool:
@@ -463,43 +633,157 @@ def delete_skill_from_database(skill_name: str) -> bool:
             return result is not None
 
 
+_SKILL_METADATA_COLUMNS = """
+    id::text, name, description, executor, enabled, created_at, updated_at, source, action_config, llm_model,
+    workspace_id::text, owner_id::text, is_public
+"""
+
+
+def _skill_metadata_from_row(row) -> Dict[str, Any]:
+    """Build a skill metadata dict from a _SKILL_METADATA_COLUMNS row."""
+    return {
+        "id": row[0],
+        "name": row[1],
+        "description": row[2],
+        "executor": row[3],
+        "enabled": row[4],
+        "created_at": row[5].isoformat() if row[5] else None,
+        "updated_at": row[6].isoformat() if row[6] else None,
+        "source": row[7],
+        "action_config": row[8],  # Add action_config
+        "llm_model": row[9],
+        "workspace_id": row[10],
+        "owner_id": row[11],
+        "is_public": bool(row[12]),
+    }
+
+
+def get_skills_metadata_batch(names: List[str], workspace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Get database skill metadata for several skill names in one query.
+    
+    Names are only unique per workspace, so a name may match more than one row.
+    With `workspace_id`, only rows visible in that workspace (owned, public, or
+    filesystem-sourced) are returned.
+    
+    Returns:
+        List of skill metadata dicts (same shape as get_all_skills_metadata)
+    """
+    if not names:
+        return []
+    sql = f"SELECT {_SKILL_METADATA_COLUMNS} FROM dynamic_skills WHERE name = ANY(%s)"
+    params: Tuple[Any, ...] = (list(names),)
+    if workspace_id:
+        sql += " AND (workspace_id = %s OR is_public = true OR source = 'filesystem')"
+        params += (workspace_id,)
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql + " ORDER BY name", params)
+            return [_skill_metadata_from_row(row) for row in cur.fetchall()]
+
+
 def get_all_skills_metadata() -> List[Dict[str, Any]]:
     """
     Get metadata for all skills (filesystem + database) without loading full configs.
     
+    Served from memory until the registry is reloaded (any skill create/update/delete
+    reloads it) or the short TTL expires, so repeated list calls skip the scan.
+    
     Returns:
         List of skill metadata dicts with name, description, source, etc.
     """
-    skills = []
+    global _skills_metadata_cache
+    
+    cached = _skills_metadata_cache
+    if (
+        cached
+        and cached[0] == _registry_version
+        and (time.time() - cached[1]) < _METADATA_CACHE_TTL_SECONDS
+    ):
+        return list(cached[2])
     
-    # Get database skills
+    version = _registry_version
+    skills = _load_all_skills_metadata()
+    _skills_metadata_cache = (version, time.time(), skills)
+    return list(skills)
+
+
+def get_all_skills_metadata_batch(workspace_id: str, include_public: bool = True) -> List[Dict[str, Any]]:
+    """
+    Get metadata for the skills visible in a workspace: filesystem skills plus
+    database skills owned by the workspace (and public ones if include_public).
+    
+    The visibility filter runs in SQL, so only visible rows leave the database.
+    Cached per workspace like get_all_skills_metadata.
+    
+    Returns:
+        List of skill metadata dicts (same shape as get_all_skills_metadata)
+    """
+    key = (workspace_id, include_public)
+    cached = _workspace_metadata_cache.get(key)
+    if (
+        cached
+        and cached[0] == _registry_version
+        and (time.time() - cached[1]) < _METADATA_CACHE_TTL_SECONDS
+    ):
+        return list(cached[2])
+    
+    version = _registry_version
+    if include_public:
+        where = "WHERE workspace_id = %s OR is_public = true OR source = 'filesystem'"
+    else:
+        where = "WHERE workspace_id = %s OR source = 'filesystem'"
+    params = (workspace_id,)
+    skills = _load_database_skills_metadata(where, params) + _cached_filesystem_skills_metadata()
+    if len(_workspace_metadata_cache) >= _WORKSPACE_METADATA_CACHE_MAX_ENTRIES:
+        _workspace_metadata_cache.clear()
+    _workspace_metadata_cache[key] = (version, time.time(), skills)
+    return list(skills)
+
+
+def _load_all_skills_metadata() -> List[Dict[str, Any]]:
+    """Scan the database and skills directory for skill metadata (uncached)."""
+    return _load_database_skills_metadata() + _cached_filesystem_skills_metadata()
+
+
+def _load_database_skills_metadata(where: str = "", params: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
+    """Fetch dynamic_skills metadata rows matching an optional WHERE clause."""
+    skills = []
     try:
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT id::text, name, description, executor, enabled, created_at, updated_at, source, action_config, llm_model,
-                           workspace_id::text, owner_id::text, is_public
-                    FROM dynamic_skills
-                    ORDER BY name
-                """)
+                cur.execute(f"SELECT {_SKILL_METADATA_COLUMNS} FROM dynamic_skills {where} ORDER BY name", params)
                 for row in cur.fetchall():
-                    skills.append({
-                        "id": row[0],
-                        "name": row[1],
-                        "description": row[2],
-                        "executor": row[3],
-                        "enabled": row[4],
-                        "created_at": row[5].isoformat() if row[5] else None,
-                        "updated_at": row[6].isoformat() if row[6] else None,
-                        "source": row[7],
-                        "action_config": row[8],  # Add action_config
-                        "llm_model": row[9],
-                        "workspace_id": row[10],
-                        "owner_id": row[11],
-                        "is_public": bool(row[12]),
-                    })
+                    skills.append(_skill_metadata_from_row(row))
     except Exception as e:
         print(f"[SKILL_DB] Warning: Failed to get database skills: {e}")
+    return skills
+
+
+def _cached_filesystem_skills_metadata() -> List[Dict[str, Any]]:
+    """
+    Filesystem skill metadata, scanned once per registry version and TTL window and
+    shared by every workspace listing (filesystem skills are visible everywhere).
+    """
+    global _filesystem_metadata_cache
+    
+    cached = _filesystem_metadata_cache
+    if (
+        cached
+        and cached[0] == _registry_version
+        and (time.time() - cached[1]) < _METADATA_CACHE_TTL_SECONDS
+    ):
+        return cached[2]
+    
+    version = _registry_version
+    skills = _load_filesystem_skills_metadata()
+    _filesystem_metadata_cache = (version, time.time(), skills)
+    return skills
+
+
+def _load_filesystem_skills_metadata() -> List[Dict[str, Any]]:
+    """Read name/description/executor from each skills/*/skill.md frontmatter."""
+    skills = []
     
     # Get filesystem skills
     try:
@@ -547,6 +831,7 @@ def reload_skill_registry(workspace_id: Optional[str] = None, include_public: bo
     """
     from engine import load_skill_registry, Skill
     import engine
+    global _registry_version
     
     # Load from filesystem
     filesystem_skills = load_skill_registry()
@@ -567,9 +852,125 @@ def reload_skill_registry(workspace_id: Optional[str] = None, include_public: bo
     skill_map = {_skill_key(s): s for s in filesystem_skills}
     for db_skill in db_skills:
         skill_map[_skill_key(db_skill)] = db_skill
-    engine.SKILL_REGISTRY = list(skill_map.values())
+    registry = list(skill_map.values())
+    with _registry_lock:
+        engine.SKILL_REGISTRY = registry
+        engine.SKILL_REGISTRY_BY_NAME = engine._index_skills_by_name(registry)
+        _registry_version += 1
     
     scope_msg = f" for workspace {workspace_id}" if workspace_id else ""
-    print(f"[SKILL_DB] Reloaded {len(engine.SKILL_REGISTRY)} skills ({len(filesystem_skills)} from files, {len(db_skills)} from database){scope_msg}")
+    print(f"[SKILL_DB] Reloaded {len(registry)} skills ({len(filesystem_skills)} from files, {len(db_skills)} from database){scope_msg}")
     
-    return len(engine.SKILL_REGISTRY)
+    return len(registry)
+
+
+# Background full reloads are coalesced: requests arriving while one is queued share it.
+_RELOAD_DEBOUNCE_SECONDS = 0.2
+_reload_pending = False
+_reload_lock = asyncio.Lock()
+
+
+async def request_registry_reload() -> None:
+    """
+    Reload the full skill registry off the request path (use as a BackgroundTask).
+    
+    Waits a short debounce window, then runs reload_skill_registry in a worker
+    thread. Calls made while a reload is already queued return immediately,
+    since the queued reload has not started yet and will see their changes.
+    """
+    global _reload_pending
+    if _reload_pending:
+        return
+    _reload_pending = True
+    await asyncio.sleep(_RELOAD_DEBOUNCE_SECONDS)
+    async with _reload_lock:
+        _reload_pending = False
+        await asyncio.to_thread(reload_skill_registry)
+
+
+def _swap_registry_skill(skill_id: str, new_skill=None) -> int:
+    """Replace (or drop) the database skill with this ID in the live registry."""
+    import engine
+    global _registry_version
+    
+    with _registry_lock:
+        registry = [
+            s for s in engine.SKILL_REGISTRY
+            if not (s.db_metadata and s.db_metadata.get("id") == skill_id)
+        ]
+        if new_skill is not None:
+            # Same key rule as reload_skill_registry: module_name identifies the skill
+            registry = [s for s in registry if s.module_name != new_skill.module_name]
+            registry.append(new_skill)
+        engine.SKILL_REGISTRY = registry
+        engine.SKILL_REGISTRY_BY_NAME = engine._index_skills_by_name(registry)
+        _registry_version += 1
+        return len(registry)
+
+
+def reload_single_skill(skill_id: str) -> int:
+    """
+    Re-materialize one database skill into the registry without a full reload.
+    
+    A skill that is missing, disabled, or fails to load is dropped from the registry.
+    
+    Returns:
+        Total number of skills in the registry
+    """
+    from engine import Skill
+    
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT {_SKILL_LOAD_COLUMNS} FROM dynamic_skills WHERE id = %s", (skill_id,))
+            row = cur.fetchone()
+    
+    new_skill = None
+    if row and row[19]:  # enabled
+        try:
+            new_skill = Skill(**_skill_dict_from_row(row))
+        except Exception as e:
+            print(f"[SKILL_DB] Warning: Failed to reload skill '{row[0]}': {e}")
+    
+    count = _swap_registry_skill(skill_id, new_skill)
+    print(f"[SKILL_DB] Reloaded skill {skill_id} ({'loaded' if new_skill else 'removed'}); {count} skills in registry")
+    return count
+
+
+def unload_skill(skill_id: str) -> int:
+    """
+    Remove a deleted database skill from the registry without a full reload.
+    
+    Returns:
+        Total number of skills in the registry
+    """
+    return _swap_registry_skill(skill_id)
+
+
+def create_skill_and_load(skill_data: Dict[str, Any]) -> Tuple[str, int]:
+    """
+    Insert a new database skill and add it to the registry as one unit.
+    
+    The skill is validated from the inserted row before the transaction commits,
+    so a skill that cannot be loaded is rolled back instead of becoming visible in
+    the database but missing from the registry. Its inline functions are registered
+    only once the commit succeeds.
+    
+    Returns:
+        (skill_id, total number of skills in the registry)
+    """
+    from engine import Skill
+    
+    with get_db_connection() as conn:
+        skill_id = save_skill_to_database(skill_data, conn=conn)
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT {_SKILL_LOAD_COLUMNS} FROM dynamic_skills WHERE id = %s", (skill_id,))
+            row = cur.fetchone()
+        # Raises (and the connection context rolls back) if the row is not a valid skill
+        if row[19]:
+            Skill(**_skill_dict_from_row(row, register=False))
+        conn.commit()
+    
+    new_skill = Skill(**_skill_dict_from_row(row)) if row[19] else None
+    count = _swap_registry_skill(skill_id, new_skill)
+    print(f"[SKILL_DB] Created skill {skill_id} ({'loaded' if new_skill else 'disabled'}); {count} skills in registry")
+    return skill_id, count
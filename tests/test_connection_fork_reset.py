@@ -0,0 +1,83 @@
+"""
+Unit tests for per-process database clients after fork.
+
+Tests cover:
+- services.connection_pool dropping its shared clients in a forked child
+- data.mongo handing a forked child a different client than its parent
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import project modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+import data.mongo as mongo
+import services.connection_pool as connection_pool
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "register_at_fork"), reason="os.fork is not available on this platform"
+)
+
+
+def _run_in_child(check) -> int:
+    """Fork, run `check()` in the child and return its exit status (0 when it returned True)."""
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            code = 0 if check() else 1
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(status)
+
+
+@pytest.fixture
+def shared_clients(monkeypatch):
+    """Install a fake pooled Mongo client in the parent, as initialize_pools() would."""
+    parent_client = object()
+    monkeypatch.setattr(connection_pool, "_mongo_client", parent_client)
+    monkeypatch.setattr(connection_pool, "_postgres_pool", object())
+    monkeypatch.setattr(connection_pool, "_initialized", True)
+    mongo._reset_after_fork()
+    yield parent_client
+    mongo._reset_after_fork()
+
+
+class TestForkReset:
+    """Test that forked workers do not reuse the parent's clients"""
+
+    def test_parent_uses_pooled_client(self, shared_clients):
+        assert mongo.get_client() is shared_clients
+
+    def test_child_drops_connection_pool_state(self, shared_clients):
+        def check():
+            return (
+                connection_pool._mongo_client is None
+                and connection_pool._postgres_pool is None
+                and not connection_pool._initialized
+            )
+
+        assert _run_in_child(check) == 0
+        # The parent keeps its clients
+        assert connection_pool._mongo_client is shared_clients
+
+    def test_child_gets_different_client(self, shared_clients):
+        parent_client = mongo.get_client()
+
+        def check():
+            # Stand in for a real initialize_pools() so the child needs no server
+            def initialize_pools(force=False):
+                connection_pool._mongo_client = object()
+                connection_pool._initialized = True
+
+            connection_pool.initialize_pools = initialize_pools
+            client = mongo.get_client()
+            return client is connection_pool._mongo_client and client is not parent_client
+
+        assert _run_in_child(check) == 0
+        assert mongo.get_client() is parent_client
@@ -0,0 +1,282 @@
+"""
+Unit tests for the run manager API (no database required).
+
+Tests cover:
+- Keyset cursor encoding, including runs with NULL created_at
+- Cursor paging returning the same rows as offset paging
+- Bulk delete reporting across all run tables
+- Per-run retry when the batch delete fails
+"""
+
+import asyncio
+import json
+import re
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path to import api modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+import api.run_manager_api as run_manager_api
+from api.run_manager_api import (
+    BulkDeleteRequest,
+    _build_run_list_sql,
+    _decode_cursor,
+    _encode_cursor,
+    delete_runs_bulk,
+    list_runs_simplified,
+)
+
+_RUN_TABLES = ("checkpoint_writes", "checkpoint_blobs", "checkpoints", "thread_logs", "run_metadata")
+
+
+def _sorted_runs(rows):
+    """Order rows like the SQL: created_at DESC NULLS LAST, thread_id DESC."""
+    by_id = sorted(rows, key=lambda r: r["thread_id"], reverse=True)
+    return sorted(by_id, key=lambda r: (r["created_at"] is not None, r["created_at"] or datetime.min), reverse=True)
+
+
+class FakeRunListCursor:
+    """Evaluates the unfiltered run list statements over an in-memory list of runs."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.result = []
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params, prepare=False):
+        count_sql, page_sql, keyset_sql, keyset_null_sql = _build_run_list_sql(False, False, False)
+        self.executed.append((sql, list(params)))
+        ordered = _sorted_runs(self.rows)
+        if sql == count_sql:
+            self.result = [{"count": len(self.rows)}]
+        elif sql == page_sql:
+            limit, offset = params
+            self.result = [{**r, "total": len(self.rows)} for r in ordered[offset:offset + limit]]
+        elif sql == keyset_sql:
+            created_at, thread_id, limit = params
+            self.result = [
+                r for r in ordered
+                if r["created_at"] is None or (r["created_at"], r["thread_id"]) < (created_at, thread_id)
+            ][:limit]
+        elif sql == keyset_null_sql:
+            thread_id, limit = params
+            self.result = [r for r in ordered if r["created_at"] is None and r["thread_id"] < thread_id][:limit]
+        else:
+            raise AssertionError(f"Unexpected SQL: {sql}")
+
+    def __iter__(self):
+        return iter(self.result)
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+
+class FakeDeleteCursor:
+    """Deletes thread ids from in-memory tables, returning each removed id once."""
+
+    def __init__(self, tables, fail_on):
+        self.tables = tables
+        self.fail_on = fail_on
+        self.result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        (ids,) = params
+        if self.fail_on in ids:
+            raise RuntimeError(f"cannot delete {self.fail_on}")
+        table = re.search(r"DELETE FROM (\w+)", sql).group(1)
+        removed = [thread_id for thread_id in ids if thread_id in self.tables[table]]
+        self.tables[table] -= set(removed)
+        self.result = [(thread_id,) for thread_id in removed]
+
+    def fetchall(self):
+        return self.result
+
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+
+    def cursor(self, row_factory=None):
+        if self.pool.run_rows is not None:
+            cur = FakeRunListCursor(self.pool.run_rows)
+            self.pool.cursors.append(cur)
+            return cur
+        return FakeDeleteCursor(self.pool.tables, self.pool.fail_on)
+
+    def transaction(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakePool:
+    max_size = 4
+
+    def __init__(self, run_rows=None, tables=None, fail_on=None):
+        self.run_rows = run_rows
+        self.tables = tables
+        self.fail_on = fail_on
+        self.cursors = []
+
+    def getconn(self):
+        return FakeConnection(self)
+
+    def putconn(self, conn):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches(monkeypatch):
+    monkeypatch.setattr(run_manager_api, "emit_log", lambda *args, **kwargs: None)
+    run_manager_api._invalidate_run_caches()
+    yield
+    run_manager_api._invalidate_run_caches()
+
+
+def _make_runs():
+    """Seven dated runs (two sharing a timestamp) and three runs without created_at."""
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    rows = []
+    for i in range(7):
+        rows.append({"thread_id": f"t{i}", "created_at": base + timedelta(minutes=i // 2)})
+    for thread_id in ("n1", "n2", "n3"):
+        rows.append({"thread_id": thread_id, "created_at": None})
+    for row in rows:
+        row.update(run_name=None, status="completed", username="alice", workspace_id=None, workspace_name=None)
+    return rows
+
+
+def _list(pool, monkeypatch, **kwargs):
+    monkeypatch.setattr(run_manager_api, "get_postgres_pool", lambda: pool)
+    params = {"page": 1, "page_size": 3, "username": None, "workspace": None, "search": None, "cursor": None}
+    params.update(kwargs)
+    response = asyncio.run(list_runs_simplified(None, **params))
+    return json.loads(response.body)
+
+
+class TestCursorEncoding:
+    """Test _encode_cursor/_decode_cursor round-trips"""
+
+    def test_round_trip_with_timestamp(self):
+        created_at = datetime(2026, 1, 1, 12, 30, 5)
+        assert _decode_cursor(_encode_cursor(created_at, "thread-1")) == (created_at, "thread-1")
+
+    def test_round_trip_with_null_timestamp(self):
+        assert _decode_cursor(_encode_cursor(None, "thread-1")) == (None, "thread-1")
+
+    def test_thread_id_may_contain_separator(self):
+        assert _decode_cursor(_encode_cursor(None, "a|b")) == (None, "a|b")
+
+    def test_keyset_sql_admits_null_rows(self):
+        _, _, keyset_sql, keyset_null_sql = _build_run_list_sql(False, False, False)
+        assert "OR rm.created_at IS NULL" in keyset_sql
+        assert "rm.created_at IS NULL AND rm.thread_id < %s" in keyset_null_sql
+
+
+class TestKeysetPagination:
+    """Test that cursor paging and offset paging return the same rows"""
+
+    def test_cursor_pages_match_offset_pages(self, monkeypatch):
+        pool = FakePool(run_rows=_make_runs())
+        offset_ids = []
+        for page in range(1, 5):
+            offset_ids += [run["id"] for run in _list(pool, monkeypatch, page=page)["runs"]]
+
+        cursor_ids = []
+        cursor = None
+        while True:
+            body = _list(pool, monkeypatch, cursor=cursor)
+            cursor_ids += [run["id"] for run in body["runs"]]
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+
+        assert len(offset_ids) == 10
+        assert cursor_ids == offset_ids
+        assert offset_ids[-3:] == ["n3", "n2", "n1"]
+
+    def test_cursor_from_null_row_uses_null_phase(self, monkeypatch):
+        pool = FakePool(run_rows=_make_runs())
+        _list(pool, monkeypatch, cursor=_encode_cursor(None, "n3"))
+        _, _, _, keyset_null_sql = _build_run_list_sql(False, False, False)
+        sql, params = pool.cursors[-1].executed[0]
+        assert sql == keyset_null_sql
+        assert params == ["n3", 3]
+
+    def test_full_page_ending_on_null_row_has_cursor(self, monkeypatch):
+        pool = FakePool(run_rows=_make_runs())
+        body = _list(pool, monkeypatch, page=3)
+        assert [run["id"] for run in body["runs"]] == ["t0", "n3", "n2"]
+        assert _decode_cursor(body["next_cursor"]) == (None, "n2")
+
+    def test_invalid_cursor_is_rejected(self, monkeypatch):
+        from fastapi import HTTPException
+
+        with pytest.raises(HTTPException) as exc_info:
+            _list(FakePool(run_rows=[]), monkeypatch, cursor="not-a-cursor")
+        assert exc_info.value.status_code == 400
+
+    def test_cursor_page_reuses_cached_total(self, monkeypatch):
+        pool = FakePool(run_rows=_make_runs())
+        first = _list(pool, monkeypatch)
+        pool.run_rows.append({**pool.run_rows[0], "thread_id": "t9"})
+        second = _list(pool, monkeypatch, cursor=first["next_cursor"])
+        assert second["total"] == first["total"] == 10
+
+
+class TestBulkDelete:
+    """Test delete_runs_bulk success/failure reporting"""
+
+    def _delete(self, pool, monkeypatch, thread_ids):
+        monkeypatch.setattr(run_manager_api, "get_postgres_pool", lambda: pool)
+        return asyncio.run(delete_runs_bulk(None, BulkDeleteRequest(thread_ids=thread_ids)))
+
+    def test_run_without_metadata_counts_as_deleted(self, monkeypatch):
+        tables = {table: set() for table in _RUN_TABLES}
+        tables["run_metadata"] = {"a"}
+        tables["checkpoints"] = {"a", "orphan"}
+        tables["thread_logs"] = {"orphan"}
+        result = self._delete(FakePool(tables=tables), monkeypatch, ["a", "orphan"])
+        assert result.deleted_count == 2
+        assert result.failed == []
+        assert all(not ids for ids in tables.values())
+
+    def test_unknown_run_is_reported_not_found(self, monkeypatch):
+        tables = {table: {"a"} for table in _RUN_TABLES}
+        result = self._delete(FakePool(tables=tables), monkeypatch, ["a", "missing", "a"])
+        assert result.deleted_count == 1
+        assert result.failed == [{"thread_id": "missing", "error": "Run not found"}]
+
+    def test_failing_run_does_not_block_the_rest(self, monkeypatch):
+        tables = {table: {"a", "b", "bad"} for table in _RUN_TABLES}
+        result = self._delete(FakePool(tables=tables, fail_on="bad"), monkeypatch, ["a", "bad", "b"])
+        assert result.deleted_count == 2
+        assert result.failed == [{"thread_id": "bad", "error": "cannot delete bad"}]
+        assert tables["run_metadata"] == {"bad"}
+
+    def test_empty_request_is_rejected(self, monkeypatch):
+        from fastapi import HTTPException
+
+        with pytest.raises(HTTPException) as exc_info:
+            self._delete(FakePool(tables={}), monkeypatch, [])
+        assert exc_info.value.status_code == 400
@@ -0,0 +1,299 @@
+"""
+Unit tests for skill updates and single-skill registry patches (no database required).
+
+Tests cover:
+- Optimistic concurrency on update_skill (if_match_version -> 409)
+- Replacing and dropping one database skill in the live registry
+- reload_single_skill / unload_skill without a full registry reload
+- Concurrent single-skill patches not overwriting each other
+- create_skill_and_load registering inline code only after commit
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path to import project modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from fastapi import HTTPException
+
+import api.skills_api as skills_api
+import engine
+import skill_manager
+from api.skills_api import SkillUpdateRequest, update_skill
+
+SKILL_ID = "0b6c3a52-5d1e-4a8e-9a51-7f0e2c1d4b11"
+OTHER_ID = "7d2f9e10-3c4b-4f6a-8e21-9a0b1c2d3e4f"
+USER = SimpleNamespace(id="user-1", is_admin=False)
+
+
+def _update_row(version=3):
+    """A _SKILL_UPDATE_SELECT row for an LLM database skill owned by USER."""
+    row = [None] * 24
+    row[0] = "summarize"
+    row[1] = "summarize_ws"
+    row[2] = "old description"
+    row[6] = "llm"
+    row[16] = USER.id
+    row[17] = False
+    row[18] = "database"
+    row[19] = version
+    row[23] = True
+    return tuple(row)
+
+
+@pytest.fixture
+def skill_db(monkeypatch):
+    """Patch the database calls update_skill makes; records update_skill_fields calls."""
+    state = SimpleNamespace(row=_update_row(), updated=(SKILL_ID, 4), calls=[], reloaded=[])
+
+    def fake_update_skill_fields(skill_id, module_name, fields, expected_version=None):
+        state.calls.append((skill_id, fields, expected_version))
+        return state.updated
+
+    def fake_reload_single_skill(skill_id):
+        state.reloaded.append(skill_id)
+        return 1
+
+    monkeypatch.setattr(skills_api, "_fetch_skill_row", lambda sql, params, **kwargs: state.row)
+    monkeypatch.setattr(skills_api, "update_skill_fields", fake_update_skill_fields)
+    monkeypatch.setattr(skills_api, "reload_single_skill", fake_reload_single_skill)
+    return state
+
+
+def _update(**fields):
+    return asyncio.run(update_skill(SKILL_ID, SkillUpdateRequest(**fields), USER))
+
+
+class TestOptimisticUpdate:
+    """Test the if_match_version guard on update_skill"""
+
+    def test_stale_version_is_rejected_before_writing(self, skill_db):
+        with pytest.raises(HTTPException) as exc_info:
+            _update(description="new", if_match_version=2)
+        assert exc_info.value.status_code == 409
+        assert skill_db.calls == []
+
+    def test_concurrent_bump_after_read_is_rejected(self, skill_db):
+        # The row matched when read, but the guarded UPDATE found a newer version
+        skill_db.updated = None
+        with pytest.raises(HTTPException) as exc_info:
+            _update(description="new", if_match_version=3)
+        assert exc_info.value.status_code == 409
+        assert skill_db.calls[0][2] == 3
+        assert skill_db.reloaded == []
+
+    def test_matching_version_updates_and_reloads(self, skill_db):
+        result = _update(description="new", if_match_version=3)
+        assert result["status"] == "updated"
+        assert result["version"] == 4
+        _, fields, expected_version = skill_db.calls[0]
+        assert fields["description"] == "new"
+        assert expected_version == 3
+        assert skill_db.reloaded == [SKILL_ID]
+
+    def test_missing_skill_without_version_is_not_found(self, skill_db):
+        skill_db.updated = None
+        with pytest.raises(HTTPException) as exc_info:
+            _update(description="new")
+        assert exc_info.value.status_code == 404
+
+    def test_malformed_id_is_rejected(self, skill_db):
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(update_skill("not-a-uuid", SkillUpdateRequest(description="new"), USER))
+        assert exc_info.value.status_code == 422
+
+
+def _skill(name, module_name, skill_id=None):
+    return SimpleNamespace(
+        name=name,
+        module_name=module_name,
+        db_metadata={"id": skill_id} if skill_id else None,
+        workspace_id=None,
+        is_public=True,
+    )
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Install a small registry: one filesystem skill and two database skills."""
+    skills = [
+        _skill("fetch", "fetch"),
+        _skill("summarize", "summarize_ws", SKILL_ID),
+        _skill("translate", "translate_ws", OTHER_ID),
+    ]
+    monkeypatch.setattr(engine, "SKILL_REGISTRY", skills)
+    monkeypatch.setattr(engine, "SKILL_REGISTRY_BY_NAME", engine._index_skills_by_name(skills))
+    return skills
+
+
+@contextmanager
+def _fake_cursor(row):
+    yield SimpleNamespace(execute=lambda sql, params: None, fetchone=lambda: row)
+
+
+@contextmanager
+def _fake_connection(row):
+    yield SimpleNamespace(cursor=lambda: _fake_cursor(row))
+
+
+def _load_row(enabled):
+    row = [None] * 20
+    row[0] = "summarize"
+    row[19] = enabled
+    return tuple(row)
+
+
+class TestRegistryPatch:
+    """Test single-skill registry updates"""
+
+    def test_unload_drops_only_that_skill(self, registry):
+        version = skill_manager.get_registry_version()
+        count = skill_manager.unload_skill(SKILL_ID)
+        assert count == 2
+        assert [s.name for s in engine.SKILL_REGISTRY] == ["fetch", "translate"]
+        assert "summarize" not in engine.SKILL_REGISTRY_BY_NAME
+        assert skill_manager.get_registry_version() == version + 1
+
+    def test_registry_is_rebound_not_mutated(self, registry):
+        skill_manager.unload_skill(SKILL_ID)
+        # Per-workspace views key off the list object, so the old list must stay intact
+        assert engine.SKILL_REGISTRY is not registry
+        assert len(registry) == 3
+
+    def test_swap_replaces_skill_with_same_id(self, registry):
+        replacement = _skill("summarize", "summarize_ws", SKILL_ID)
+        count = skill_manager._swap_registry_skill(SKILL_ID, replacement)
+        assert count == 3
+        assert engine.SKILL_REGISTRY_BY_NAME["summarize"] == [replacement]
+
+    def test_swap_drops_stale_entry_with_same_module(self, registry):
+        # A skill recreated under a new ID replaces the old one with its module_name
+        replacement = _skill("summarize", "summarize_ws", "new-id")
+        count = skill_manager._swap_registry_skill("new-id", replacement)
+        assert count == 3
+        assert [s for s in engine.SKILL_REGISTRY if s.module_name == "summarize_ws"] == [replacement]
+
+    def test_reload_single_skill_loads_enabled_row(self, registry, monkeypatch):
+        loaded = _skill("summarize", "summarize_ws", SKILL_ID)
+        monkeypatch.setattr(skill_manager, "get_db_connection", lambda: _fake_connection(_load_row(True)))
+        monkeypatch.setattr(skill_manager, "_skill_dict_from_row", lambda row: {})
+        monkeypatch.setattr(engine, "Skill", lambda **kwargs: loaded)
+        assert skill_manager.reload_single_skill(SKILL_ID) == 3
+        assert engine.SKILL_REGISTRY_BY_NAME["summarize"] == [loaded]
+
+    def test_reload_single_skill_drops_disabled_row(self, registry, monkeypatch):
+        monkeypatch.setattr(skill_manager, "get_db_connection", lambda: _fake_connection(_load_row(False)))
+        assert skill_manager.reload_single_skill(SKILL_ID) == 2
+        assert "summarize" not in engine.SKILL_REGISTRY_BY_NAME
+
+    def test_reload_single_skill_drops_missing_row(self, registry, monkeypatch):
+        monkeypatch.setattr(skill_manager, "get_db_connection", lambda: _fake_connection(None))
+        assert skill_manager.reload_single_skill(SKILL_ID) == 2
+
+    def test_reload_single_skill_drops_unloadable_row(self, registry, monkeypatch):
+        def broken_skill(**kwargs):
+            raise ValueError("bad skill definition")
+
+        monkeypatch.setattr(skill_manager, "get_db_connection", lambda: _fake_connection(_load_row(True)))
+        monkeypatch.setattr(skill_manager, "_skill_dict_from_row", lambda row: {})
+        monkeypatch.setattr(engine, "Skill", broken_skill)
+        assert skill_manager.reload_single_skill(SKILL_ID) == 2
+        assert [s.name for s in engine.SKILL_REGISTRY] == ["fetch", "translate"]
+
+
+class _SlowRegistry(list):
+    """Registry list whose iteration yields to other threads, widening any read-rebuild race."""
+
+    def __iter__(self):
+        for item in list.__iter__(self):
+            time.sleep(0.01)
+            yield item
+
+
+class TestConcurrentRegistryPatch:
+    """Test that concurrent single-skill patches are serialized"""
+
+    def test_concurrent_swaps_keep_both_skills(self, registry, monkeypatch):
+        monkeypatch.setattr(engine, "SKILL_REGISTRY", _SlowRegistry(registry))
+        version = skill_manager.get_registry_version()
+        new_skills = [_skill(f"new{i}", f"new{i}_ws", f"new-id-{i}") for i in range(2)]
+        threads = [
+            threading.Thread(target=skill_manager._swap_registry_skill, args=(s.db_metadata["id"], s))
+            for s in new_skills
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(s in engine.SKILL_REGISTRY for s in new_skills)
+        assert len(engine.SKILL_REGISTRY) == 5
+        assert skill_manager.get_registry_version() == version + 2
+
+
+def _action_row():
+    """A _SKILL_LOAD_COLUMNS row for an enabled python_function skill with inline code."""
+    return (
+        "echo", "echo_ws", "Echo input", ["x"], ["x"], [],
+        "action", False, None, None, None,
+        None, {"type": "python_function", "function": "run"}, "def run(x):\n    return x\n", None,
+        None, USER.id, False,
+        "new-skill-id", True, None, None, 1,
+    )
+
+
+class _TransactionConnection:
+    """Connection whose commit() raises `commit_error` when set."""
+
+    def __init__(self, row, commit_error=None):
+        self.row = row
+        self.commit_error = commit_error
+
+    def cursor(self):
+        return _fake_cursor(self.row)
+
+    def commit(self):
+        if self.commit_error:
+            raise self.commit_error
+
+
+class TestCreateSkillAndLoad:
+    """Test that create_skill_and_load registers inline code only for committed skills"""
+
+    @pytest.fixture
+    def create_env(self, registry, monkeypatch):
+        registered = []
+        monkeypatch.setattr(skill_manager, "save_skill_to_database", lambda data, conn=None: "new-skill-id")
+        monkeypatch.setattr(
+            skill_manager, "_register_inline_action",
+            lambda module_name, function_name, code: registered.append((module_name, function_name)),
+        )
+        monkeypatch.setattr(engine, "Skill", lambda **kwargs: SimpleNamespace(**kwargs))
+        return registered
+
+    def _use_connection(self, monkeypatch, conn):
+        @contextmanager
+        def get_db_connection():
+            yield conn
+
+        monkeypatch.setattr(skill_manager, "get_db_connection", get_db_connection)
+
+    def test_failed_commit_registers_nothing(self, create_env, monkeypatch):
+        self._use_connection(monkeypatch, _TransactionConnection(_action_row(), RuntimeError("commit failed")))
+        with pytest.raises(RuntimeError):
+            skill_manager.create_skill_and_load({"name": "echo"})
+        assert create_env == []
+        assert len(engine.SKILL_REGISTRY) == 3
+
+    def test_committed_skill_is_registered_and_loaded(self, create_env, monkeypatch):
+        self._use_connection(monkeypatch, _TransactionConnection(_action_row()))
+        skill_id, count = skill_manager.create_skill_and_load({"name": "echo"})
+        assert (skill_id, count) == ("new-skill-id", 4)
+        assert create_env == [("echo_ws", "run")]
+        assert engine.SKILL_REGISTRY_BY_NAME["echo"][0].action.module == "dynamic_skills.echo_ws"
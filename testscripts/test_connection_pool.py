@@ -77,7 +77,7 @@ def test_configuration():
     """Test that configuration can be loaded."""
     print("\nTesting configuration...")
     
-    from services.connection_pool import _get_postgres_config, _get_mongo_config
+    from services.connection_pool import _get_postgres_config, get_mongo_config
     
     try:
         pg_config = _get_postgres_config()
@@ -87,7 +87,7 @@ def test_configuration():
         return False
     
     try:
-        mongo_config = _get_mongo_config()
+        mongo_config = get_mongo_config()
         print(f"✓ MongoDB config loaded: maxPoolSize={mongo_config['maxPoolSize']}")
     except Exception as e:
         print(f"✗ Failed to load MongoDB config: {e}")